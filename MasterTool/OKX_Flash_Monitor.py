@@ -1,9 +1,13 @@
-import requests
 import time
 import json
 import os
+import sys
 from datetime import datetime
 
+# 共享模块 (httpclient.py) 在仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from httpclient import HttpClient, RetryPolicy
+
 # ================= 配置区域 =================
 # 监控间隔 (秒)
 CHECK_INTERVAL = 60 
@@ -13,6 +17,9 @@ API_URL = "https://www.okx.com/api/v5/public/instruments?instType=SPOT"
 
 # 本地数据库 (用来存已知的币，防止重复报警)
 DB_FILE = "known_coins.json"
+
+# 伪装成浏览器，虽然 OKX API 一般不封，但保险起见；keep-alive 连接在每轮扫描间复用
+HTTP = HttpClient(headers={'User-Agent': 'Mozilla/5.0'}, timeout=10, retry=RetryPolicy(retries=2, backoff=2.0))
 # ===========================================
 
 def load_known_coins():
@@ -27,9 +34,7 @@ def save_known_coins(coins):
 
 def get_okx_spot_coins():
     try:
-        # 伪装成浏览器，虽然 OKX API 一般不封，但保险起见
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        resp = requests.get(API_URL, headers=headers, timeout=10)
+        resp = HTTP.get(API_URL)
         if resp.status_code == 200:
             data = resp.json()
             if data['code'] == '0':
@@ -101,6 +106,7 @@ def main():
             
         except KeyboardInterrupt:
             print("\n🛑 监控停止")
+            print(HTTP.metrics.summary())
             break
         except Exception as e:
             print(f"\n❌ 发生错误: {e}")
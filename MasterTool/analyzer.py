@@ -1,7 +1,9 @@
-import csv
+import json
 import os
+import sys
 import collections
 import re
+import time
 from datetime import datetime
 
 # ==========================================
@@ -10,6 +12,11 @@ from datetime import datetime
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 RAW_FILE = os.path.join(BASE_DIR, 'raw_keywords.csv')
 REPORT_FILE = os.path.join(BASE_DIR, 'SEO_Dashboard.html')
+# 共享模块 (textmatch.py, kwcluster.py) 在仓库根目录
+sys.path.insert(0, os.path.dirname(BASE_DIR))
+from kwcluster import KeywordClusterer
+from textmatch import PatternMatcher
+from keyword_store import KeywordStore
 
 # 内置意图分类规则
 INTENT_RULES = {
@@ -17,6 +24,10 @@ INTENT_RULES = {
     '🚦 引流 (Traffic)': ['download', 'apk', 'install', 'error', 'fix', 'bug', 'tutorial', 'guide', 'how to', '下载', '安装', '报错', '教程', '怎么', '指南', '解决', '办法'],
     '🆚 对比 (Competitor)': ['vs', 'alternative', 'better than', 'review', 'comparison', '对比', '替代', '好用', '评价']
 }
+# 所有意图规则编译成一个自动机，每个关键词只扫描一遍
+INTENT_MATCHER = PatternMatcher(INTENT_RULES)
+
+WORD_RE = re.compile(r'[\w]+')
 
 # 停用词表 (用于生成右侧热词榜，不影响主表格显示)
 STOP_WORDS = {
@@ -30,36 +41,27 @@ STOP_WORDS = {
 # 🛠️ 核心功能函数
 # ==========================================
 
-def load_raw_data():
-    """读取 Raw CSV 文件"""
-    data = []
-    if os.path.exists(RAW_FILE):
-        try:
-            with open(RAW_FILE, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    data.append(row)
-        except Exception as e:
-            print(f"Error reading {RAW_FILE}: {e}")
-    return data
+def load_raw_data(store):
+    """最近一次挖掘结果，在库里按 (关键词, 来源) 分组计数 (库还是空的话先导入 raw_keywords.csv)"""
+    run_id = store.snapshot(RAW_FILE)
+    if run_id is None:
+        return None
+    return {(kw, src): count for kw, src, count in store.observation_counts(run_id)}
+
+def aggregate_rows(rows):
+    """一遍扫描原始 (关键词, 来源) 行，得到 {(关键词, 来源): 出现次数}"""
+    return collections.Counter(rows)
 
 def classify_keyword(keyword):
     """对原始关键词进行实时分类"""
-    kw_lower = keyword.lower()
-    intents = []
-    for intent_name, keywords in INTENT_RULES.items():
-        if any(k in kw_lower for k in keywords):
-            intents.append(intent_name)
+    labels = INTENT_MATCHER.labels(keyword)
+    intents = [intent_name for intent_name in INTENT_RULES if intent_name in labels]
     return intents if intents else ['ℹ️ 其他 (Info)']
 
-def calculate_heat(keyword, raw_data_list):
-    """计算热度分数 (1-5)"""
-    mentions = [r for r in raw_data_list if r['Keyword'] == keyword]
-    sources = set(r.get('Source', '') for r in mentions)
-    count = len(mentions)
-    
+def calculate_heat(keyword, sources, count):
+    """计算热度分数 (1-5)。sources / count 是整个聚类的 (所有写法合计)"""
     score = 1
-    if 'Google' in sources and 'Bing' in sources: score += 2
+    if len(sources) >= 2: score += 2  # 多个来源都给出 (共识)，与 miner.py 一致
     if count > 1: score += 1
     if len(keyword) < 15: score += 1
     return min(score, 5)
@@ -67,36 +69,60 @@ def calculate_heat(keyword, raw_data_list):
 def get_heat_icon(score):
     return "🔥" * score
 
-def analyze_raw_data(data):
-    """全量分析原始数据"""
-    
-    # 1. 基础统计
-    total_raw = len(data)
-    sources_count = collections.Counter(r.get('Source', 'Unknown') for r in data)
+def table_payload(keywords):
+    """主表数据打包成紧凑 JSON: 每行 [热度, 关键词, 来源下标, 意图下标(, 其他写法)]"""
+    sources, intents, rows = {}, {}, []
+    for r in keywords:
+        row = [r['HeatScore'], r['Keyword'],
+               sources.setdefault(r['SourceDisplay'], len(sources)),
+               intents.setdefault(r['Intent'][0], len(intents))]
+        if r['Variants']:
+            row.append(r['Variants'])
+        rows.append(row)
+    payload = json.dumps({'sources': list(sources), 'intents': list(intents), 'rows': rows},
+                         ensure_ascii=False, separators=(',', ':'))
+    # 嵌在 <script> 里: 转义 '<'，关键词里的 "</script>" 或 "<!--" 就不会提前结束标签
+    return payload.replace('<', '\\u003c')
+
+def analyze_raw_data(pair_counts):
+    """全量分析: pair_counts 是 {(关键词, 来源): 出现次数} (见 aggregate_rows / load_raw_data)。
+
+    原始行只在分组时扫描一遍，之后的统计都按不同的 (关键词, 来源) 计算，
+    所以耗时随数据量线性增长，重复越多越省。
+    """
     
-    # 2. 关键词聚合与热度计算
-    unique_keywords = {}
+    # 1. 基础统计 + 每个写法的出现次数
+    total_raw = 0
+    sources_count = collections.Counter()
+    keyword_counts = collections.Counter()
+    clusterer = KeywordClusterer()
+    for (kw, src), count in pair_counts.items():
+        total_raw += count
+        sources_count[src] += count
+        keyword_counts[kw] += count
+        # 2. 关键词归一化 + 近似重复聚类 (空格/标点/全半角/大小写不同的写法算同一个词)
+        clusterer.add(kw, source=src, count=count)
+    clusters = clusterer.clusters()
+    print(f"🧬 归一化后 {len(clusterer)} 个关键词，近似重复合并为 {len(clusters)} 个")
     intent_stats = collections.Counter()
-    
-    for row in data:
-        kw = row['Keyword']
-        if kw not in unique_keywords:
-            unique_keywords[kw] = {
-                'Keyword': kw,
-                'Sources': set(),
-                'Count': 0,
-                'Intent': classify_keyword(kw)
-            }
-        unique_keywords[kw]['Sources'].add(row.get('Source', 'Unknown'))
-        unique_keywords[kw]['Count'] += 1
 
-    # 3. 处理列表
+    # 3. 处理列表 (每个聚类一行，用出现最多的写法展示)
     processed_list = []
-    for kw, info in unique_keywords.items():
-        score = calculate_heat(kw, data)
+    for cluster in clusters:
+        kw = cluster.canonical
+        variants = cluster.variants
+        info = {
+            'Keyword': kw,
+            'Sources': cluster.sources,
+            'Count': cluster.count,
+            # 任一写法命中的意图都算 (如 "usdt怎么购买" 带来的 购买)
+            'Intent': classify_keyword('\n'.join(variants)),
+            'Variants': [v for v, _ in variants.most_common() if v != kw],
+        }
+        score = calculate_heat(kw, cluster.sources, cluster.count)
         info['HeatScore'] = score
         info['HeatIcon'] = get_heat_icon(score)
-        info['SourceDisplay'] = " + ".join(info['Sources'])
+        info['SourceDisplay'] = " + ".join(sorted(info['Sources']))
         processed_list.append(info)
         
         # 统计意图（用于图表）
@@ -106,11 +132,13 @@ def analyze_raw_data(data):
     # 4. 排序 (按热度降序)
     processed_list.sort(key=lambda x: x['HeatScore'], reverse=True)
 
-    # 5. 词频统计
-    all_text = " ".join([d['Keyword'].lower() for d in data])
-    words = re.findall(r'[\w]+', all_text)
-    clean_words = [w for w in words if w not in STOP_WORDS and len(w) > 1 and not w.isdigit()]
-    word_freq = collections.Counter(clean_words).most_common(20)
+    # 5. 词频统计 (每个写法只分词一次，按出现次数加权)
+    word_counts = collections.Counter()
+    for kw, count in keyword_counts.items():
+        for w in WORD_RE.findall(kw.lower()):
+            if w not in STOP_WORDS and len(w) > 1 and not w.isdigit():
+                word_counts[w] += count
+    word_freq = word_counts.most_common(20)
     
     # 6. 打包数据
     analysis = {
@@ -127,6 +155,170 @@ def analyze_raw_data(data):
     
     return analysis
 
+# ==========================================
+# 🖥️ 仪表盘脚本 (普通字符串，不经过 f-string，大括号不用转义)
+# ==========================================
+
+# 搜索索引: 页面里直接加载一次 (Worker 不可用时在主线程用)，同一段源码再作为 Web Worker 启动
+SEARCH_INDEX_JS = r"""
+class KeywordIndex {
+    // texts[i] 是第 i 行的 关键词 + 其他写法；行号按热度排序，所以倒排表天然有序
+    constructor(texts) {
+        this.texts = texts.map(t => t.toLowerCase());
+        this.grams = new Map();  // 相邻两个字符 -> 含有它的行号
+        this.texts.forEach((text, id) => {
+            const seen = new Set();
+            for (let i = 0; i + 2 <= text.length; i++) {
+                const gram = text.substr(i, 2);
+                if (seen.has(gram)) continue;
+                seen.add(gram);
+                let list = this.grams.get(gram);
+                if (!list) this.grams.set(gram, list = []);
+                list.push(id);
+            }
+        });
+    }
+
+    // 子串匹配 (与原来的 indexOf 筛选一致)，返回匹配的行号
+    search(query) {
+        const q = query.toLowerCase();
+        const texts = this.texts;
+        const ids = [];
+        if (q.length < 2) {
+            for (let id = 0; id < texts.length; id++) if (texts[id].includes(q)) ids.push(id);
+            return ids;
+        }
+        // 取查询里最罕见的二元组，只校验它倒排表里的行
+        let best = null;
+        for (let i = 0; i + 2 <= q.length; i++) {
+            const list = this.grams.get(q.substr(i, 2));
+            if (!list) return ids;
+            if (!best || list.length < best.length) best = list;
+        }
+        for (const id of best) if (texts[id].includes(q)) ids.push(id);
+        return ids;
+    }
+}
+
+if (typeof document === 'undefined') {
+    // Worker: 第一条消息建索引，之后每条消息是一次搜索
+    let index = null;
+    self.onmessage = (e) => {
+        const msg = e.data;
+        if (msg.texts) {
+            index = new KeywordIndex(msg.texts);
+            return;
+        }
+        const ids = Int32Array.from(index.search(msg.query));
+        self.postMessage({seq: msg.seq, ids}, [ids.buffer]);
+    };
+}
+"""
+
+# 虚拟滚动总表: 数据来自 #keywordData，只渲染滚动窗口里的几十行
+KEYWORD_TABLE_JS = r"""
+    const kwData = JSON.parse(document.getElementById('keywordData').textContent);
+    const kwRows = kwData.rows;
+    const viewport = document.getElementById('tableViewport');
+    const tbody = document.getElementById('tableBody');
+    const countLabel = document.getElementById('tableCount');
+    const searchInput = document.getElementById('tableSearch');
+    const OVERSCAN = 10;   // 可见区域上下多渲染的行数
+    let rowHeight = 33;    // 第一次渲染后按实际行高修正
+    let matches = null;    // 当前搜索结果 (行号)，null = 全部
+    let searchSeq = 0;
+
+    const ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+    const escapeHtml = s => String(s).replace(/[&<>"']/g, c => ESCAPES[c]);
+
+    function rowHtml(row) {
+        const [heat, kw, source, intent, variants] = row;
+        // 合并进来的其他写法，鼠标悬停可见
+        const badge = variants
+            ? ` <span class="badge bg-light text-muted border" title="${escapeHtml(variants.join(' | '))}">+${variants.length}</span>`
+            : '';
+        return `<tr class="kw-row">
+            <td class="heat-icon">${'🔥'.repeat(heat)}</td>
+            <td title="${escapeHtml(kw)}">${escapeHtml(kw)}${badge}</td>
+            <td><span class="badge bg-light text-dark border badge-source">${escapeHtml(kwData.sources[source])}</span></td>
+            <td><span class="badge bg-secondary badge-source">${escapeHtml(kwData.intents[intent])}</span></td>
+            <td class="text-end">
+                <a href="https://www.xiaohongshu.com/search_result?keyword=${encodeURIComponent(kw)}" target="_blank" class="search-btn xhs-color"><i class="fas fa-book"></i></a>
+            </td>
+        </tr>`;
+    }
+
+    function renderRows() {
+        const total = matches ? matches.length : kwRows.length;
+        const top = viewport.scrollTop;
+        const first = Math.max(0, Math.floor(top / rowHeight) - OVERSCAN);
+        const last = Math.min(total, Math.ceil((top + viewport.clientHeight) / rowHeight) + OVERSCAN);
+        // 上下两个占位行撑出完整滚动高度
+        let out = `<tr style="height:${first * rowHeight}px"></tr>`;
+        for (let i = first; i < last; i++) out += rowHtml(kwRows[matches ? matches[i] : i]);
+        out += `<tr style="height:${(total - last) * rowHeight}px"></tr>`;
+        tbody.innerHTML = out;
+
+        const sample = tbody.querySelector('.kw-row');
+        if (sample && Math.abs(sample.offsetHeight - rowHeight) > 0.5) {
+            rowHeight = sample.offsetHeight;
+            renderRows();
+        }
+    }
+
+    let framePending = false;
+    viewport.addEventListener('scroll', () => {
+        if (framePending) return;
+        framePending = true;
+        requestAnimationFrame(() => { framePending = false; renderRows(); });
+    });
+
+    function showMatches(ids) {
+        matches = ids;
+        const total = matches ? matches.length : kwRows.length;
+        countLabel.textContent = `匹配 ${total} / ${kwRows.length} 条 (按热度排序，仅渲染可见行)`;
+        viewport.scrollTop = 0;
+        renderRows();
+    }
+
+    // 搜索在 Worker 里跑，打字时主线程不卡；Worker 起不来就退回主线程索引
+    const kwTexts = kwRows.map(r => r[4] ? [r[1], ...r[4]].join('\n') : r[1]);
+    let searchWorker = null;
+    let localIndex = null;
+    function useLocalIndex() {
+        searchWorker = null;
+        localIndex = new KeywordIndex(kwTexts);
+    }
+    try {
+        const source = document.getElementById('searchIndexScript').textContent;
+        searchWorker = new Worker(URL.createObjectURL(new Blob([source], {type: 'text/javascript'})));
+        searchWorker.onmessage = (e) => { if (e.data.seq === searchSeq) showMatches(e.data.ids); };
+        searchWorker.onerror = () => { useLocalIndex(); runSearch(searchInput.value); };
+        searchWorker.postMessage({texts: kwTexts});
+    } catch (err) {
+        useLocalIndex();
+    }
+
+    function runSearch(query) {
+        const seq = ++searchSeq;  // 只显示最后一次输入的结果
+        if (!query) {
+            showMatches(null);
+        } else if (searchWorker) {
+            searchWorker.postMessage({seq, query});
+        } else {
+            showMatches(Int32Array.from(localIndex.search(query)));
+        }
+    }
+
+    function filterTable(query) {
+        searchInput.value = query;
+        runSearch(query);
+        document.getElementById('mainTable').scrollIntoView({behavior: "smooth"});
+    }
+    searchInput.addEventListener('input', () => runSearch(searchInput.value));
+    showMatches(null);
+"""
+
 def generate_html(analysis):
     """生成全能版仪表盘 (无限制版)"""
     
@@ -151,10 +343,8 @@ def generate_html(analysis):
         </button>
         """
         
-    # 设置显示限制：虽然我们解除了限制，但为了防止浏览器崩溃，设置一个极高的安全上限 (比如 5000)
-    # 如果你的数据少于 5000，就会全部显示。
-    SHOW_LIMIT = 5000 
-    display_keywords = analysis['all_keywords'][:SHOW_LIMIT]
+    # 总表不再逐行写进 HTML: 全量数据作为 JSON 嵌入，由虚拟滚动表格按需渲染
+    keyword_payload = table_payload(analysis['all_keywords'])
 
     html = f"""
 <!DOCTYPE html>
@@ -179,6 +369,8 @@ def generate_html(analysis):
         .table-hover tbody tr:hover {{ background-color: #f7fafc; }}
         .chart-container {{ position: relative; height: 200px; width: 100%; }}
         .badge-source {{ font-size: 0.7em; opacity: 0.8; }}
+        #mainTable {{ table-layout: fixed; }}
+        #mainTable td {{ white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }}
     </style>
 </head>
 <body>
@@ -308,34 +500,22 @@ def generate_html(analysis):
                     <input type="text" id="tableSearch" class="form-control form-control-sm w-25" placeholder="🔍 搜索...">
                 </div>
                 <div class="card-body p-0">
-                    <div class="table-responsive" style="max-height: 800px; overflow-y: auto;">
+                    <div class="table-responsive" id="tableViewport" style="height: 800px; overflow-y: auto;">
                         <table class="table table-sm table-hover align-middle mb-0" id="mainTable">
                             <thead class="table-light sticky-top">
                                 <tr>
                                     <th width="80">热度</th>
                                     <th>关键词</th>
-                                    <th>来源</th>
-                                    <th>分类</th>
-                                    <th class="text-end">调研</th>
+                                    <th width="160">来源</th>
+                                    <th width="150">分类</th>
+                                    <th width="60" class="text-end">调研</th>
                                 </tr>
                             </thead>
-                            <tbody>
-                                {"".join([f'''
-                                <tr>
-                                    <td class="heat-icon">{r['HeatIcon']}</td>
-                                    <td>{r['Keyword']}</td>
-                                    <td><span class="badge bg-light text-dark border badge-source">{r['SourceDisplay']}</span></td>
-                                    <td><span class="badge bg-secondary badge-source">{r['Intent'][0]}</span></td>
-                                    <td class="text-end">
-                                        <a href="https://www.xiaohongshu.com/search_result?keyword={r['Keyword']}" target="_blank" class="search-btn xhs-color"><i class="fas fa-book"></i></a>
-                                    </td>
-                                </tr>
-                                ''' for r in display_keywords])} 
-                            </tbody>
+                            <tbody id="tableBody"></tbody>
                         </table>
-                        <div class="p-2 text-center text-muted small">
-                            当前展示了 {len(display_keywords)} 条数据 (Total Available: {analysis['unique_total']})
-                        </div>
+                    </div>
+                    <div class="p-2 text-center text-muted small border-top" id="tableCount">
+                        共 {analysis['unique_total']} 条数据
                     </div>
                 </div>
             </div>
@@ -354,6 +534,11 @@ def generate_html(analysis):
 
 </div>
 
+<script type="application/json" id="keywordData">{keyword_payload}</script>
+<script id="searchIndexScript">{SEARCH_INDEX_JS}</script>
+<script>
+    // Keyword Table (virtual scrolling + worker search), 不依赖 CDN 的图表库
+{KEYWORD_TABLE_JS}</script>
 <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
 <script>
     // Charts Config
@@ -375,24 +560,6 @@ def generate_html(analysis):
         options: {{ responsive: true, maintainAspectRatio: false, plugins: {{ legend: {{ position: 'bottom' }} }} }}
     }});
 
-    // Filter Logic
-    const searchInput = document.getElementById('tableSearch');
-    const table = document.getElementById('mainTable');
-    const trs = table.getElementsByTagName('tr');
-
-    function filterTable(query) {{
-        searchInput.value = query;
-        const filter = query.toLowerCase();
-        for (let i = 1; i < trs.length; i++) {{
-            const td = trs[i].getElementsByTagName('td')[1];
-            if (td) {{
-                const txtValue = td.textContent || td.innerText;
-                trs[i].style.display = txtValue.toLowerCase().indexOf(filter) > -1 ? "" : "none";
-            }}
-        }}
-        table.scrollIntoView({{behavior: "smooth"}});
-    }}
-    searchInput.addEventListener('keyup', function() {{ filterTable(this.value); }});
 </script>
 </body>
 </html>
@@ -402,12 +569,41 @@ def generate_html(analysis):
         f.write(html)
     print(f"✅ Dashboard generated successfully: {REPORT_FILE}")
 
+def _bench(max_rows):
+    """合成数据 (约 4 行一个不同写法，热门词重复多)，测 10%、50%、100% 三档看是否线性"""
+    import random
+    rng = random.Random(0)
+    coins = ['btc', 'eth', 'usdt', 'okx', 'sol', 'doge', 'pepe', 'ton', 'trx', 'xrp']
+    parts = ['怎么买', '价格', '教程', '下载', '注册', '官网', 'app', '手续费', '安全吗', 'price', 'how to buy', 'review']
+    for rows in sorted({max(max_rows // 10, 1), max(max_rows // 2, 1), max_rows}):
+        vocab = [f"{rng.choice(coins)}{' ' * rng.randint(0, 1)}{rng.choice(parts)} {i}" for i in range(max(rows // 4, 1))]
+        weights = [1 / (i + 1) for i in range(len(vocab))]
+        sources = ['Google', 'Bing']
+        data = list(zip(rng.choices(vocab, weights=weights, k=rows), rng.choices(sources, k=rows)))
+
+        t0 = time.perf_counter()
+        pair_counts = aggregate_rows(data)
+        t1 = time.perf_counter()
+        analysis = analyze_raw_data(pair_counts)
+        t2 = time.perf_counter()
+        print(f"{rows:>9} 行 ({len(pair_counts)} 个不同 关键词+来源, {analysis['unique_total']} 个聚类): "
+              f"分组 {(t1 - t0) * 1000:.0f} ms + 分析 {(t2 - t1) * 1000:.0f} ms "
+              f"= {(t2 - t0) / rows * 1e6:.1f} µs/行")
+
 def main():
-    raw_data = load_raw_data()
-    if not raw_data:
-        print("❌ No raw_keywords.csv found!")
+    if len(sys.argv) > 2 and sys.argv[1] == '--bench':
+        _bench(int(sys.argv[2]))
         return
-    analysis = analyze_raw_data(raw_data)
+    with KeywordStore() as store:
+        try:
+            pair_counts = load_raw_data(store)
+        except Exception as e:
+            print(f"Error reading keyword store: {e}")
+            return
+        if not pair_counts:
+            print("❌ 关键词库里没有数据，也没有 raw_keywords.csv!")
+            return
+        analysis = analyze_raw_data(pair_counts)
     generate_html(analysis)
 
 if __name__ == "__main__":
@@ -1,12 +1,22 @@
-import csv
+import argparse
+import hashlib
+import json
 import os
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 
 # Configuration Files
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Shared modules (textmatch.py) live in the repo root
+sys.path.insert(0, os.path.dirname(BASE_DIR))
+from textmatch import BLACKLISTED, PatternMatcher
+from keyword_store import KeywordStore
 BLACKLIST_FILE = os.path.join(BASE_DIR, 'blacklist.txt')
 INPUT_FILE = os.path.join(BASE_DIR, 'raw_keywords.csv')
 OUTPUT_FILE = os.path.join(BASE_DIR, 'final_tasks.csv')
+# Keywords per work unit handed to a worker process
+CHUNK_SIZE = 20000
 
 # Intent Classification Dictionary
 INTENT_RULES = {
@@ -31,100 +41,138 @@ def load_blacklist():
     
     return blacklist
 
-def classify_intent(keyword):
-    """Classifies keyword based on generic rules"""
-    keyword_lower = keyword.lower()
-    intents = []
-    
-    for intent, terms in INTENT_RULES.items():
-        for term in terms:
-            if term in keyword_lower:
-                intents.append(intent)
-                break # One match per category is enough
-    
+def build_matcher(blacklist):
+    """One automaton for every intent rule and the blacklist"""
+    matcher = PatternMatcher(INTENT_RULES)
+    matcher.add_terms(BLACKLISTED, blacklist)
+    return matcher
+
+def classify_intent(labels):
+    """Intent string from the labels the matcher found, in INTENT_RULES order"""
+    intents = [intent for intent in INTENT_RULES if intent in labels]
     if not intents:
         return 'Informational' # Default fallback
-    
     return ', '.join(intents)
 
-def is_blacklisted(keyword, blacklist):
-    """Checks if keyword contains any blacklisted term"""
-    keyword_lower = keyword.lower()
-    for term in blacklist:
-        if term in keyword_lower:
-            return True
-    return False
+def classify(keyword, matcher):
+    """Single pass over the keyword: None if blacklisted, else its intent"""
+    labels = matcher.labels(keyword)
+    if BLACKLISTED in labels:
+        return None
+    return classify_intent(labels)
+
+def rules_fingerprint(blacklist):
+    """Identifies the rule set; classifications made under other rules are redone"""
+    payload = json.dumps([INTENT_RULES, sorted(set(blacklist))], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+# Worker-process state, set once per process by init_worker
+_MATCHER = None
+
+def init_worker(blacklist):
+    """Pool initializer: each worker builds the automaton once, not once per chunk"""
+    global _MATCHER
+    _MATCHER = build_matcher(blacklist)
+
+def clean_chunk(rows):
+    """Classifies one chunk of (keyword_id, keyword) rows into (keyword_id, intent or None)"""
+    return [(keyword_id, classify(keyword, _MATCHER)) for keyword_id, keyword in rows]
+
+def run_chunks(chunks, blacklist, workers):
+    """Yields the classified rows of every chunk, in completion order.
+
+    At most 2 chunks per worker are in flight, so memory stays bounded no
+    matter how many keywords need classifying (Pool.imap would read the
+    whole input ahead of the workers). Order doesn't matter here: exports
+    are ordered by the store.
+    """
+    if workers <= 1:
+        init_worker(blacklist)
+        for chunk in chunks:
+            yield clean_chunk(chunk)
+        return
+
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(blacklist,)) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(clean_chunk, chunk))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Classify the mined keywords and export final_tasks.csv")
+    parser.add_argument('--input', help="Import this Keyword,Source,Seed CSV as a new snapshot first "
+                                        "(default: the latest miner run in the keyword store)")
+    parser.add_argument('--output', default=OUTPUT_FILE, help="Where to export the classified keywords")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (1 = classify in this process)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Keywords per work unit")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    output_file = args.output
     print("Starting Cleaner...")
-    
-    if not os.path.exists(INPUT_FILE):
-        print(f"Error: Input file '{INPUT_FILE}' not found.")
-        print("Please run miner.py first to generate raw keywords.")
-        return
 
     blacklist = load_blacklist()
     if not blacklist and os.path.exists(BLACKLIST_FILE):
         print("Warning: Blacklist is empty.")
+    rules = rules_fingerprint(blacklist)
+    workers = max(1, args.workers)
+    chunk_size = max(1, args.chunk_size)
 
-    processed_count = 0
-    filtered_count = 0
-    
-    final_tasks = []
-
-    try:
-        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            
-            # Check if CSV has data
-            if not reader.fieldnames:
-                print("Error: Input CSV is empty or invalid.")
-                return
-
-            for row in reader:
-                keyword = row.get('Keyword', '').strip()
-                if not keyword:
-                    continue
-                
-                processed_count += 1
-                
-                if is_blacklisted(keyword, blacklist):
-                    filtered_count += 1
-                    continue
-                
-                intent = classify_intent(keyword)
-                
-                # Create new row with classification
-                new_row = {
-                    'Keyword': keyword,
-                    'Intent': intent,
-                    'Source': row.get('Source', 'Unknown'),
-                    'Seed': row.get('Seed', '')
-                }
-                final_tasks.append(new_row)
-                
-    except Exception as e:
-        print(f"Error reading {INPUT_FILE}: {e}")
-        return
+    with KeywordStore() as store:
+        try:
+            if args.input:
+                run_id = store.import_csv(args.input)
+                print(f"Imported {args.input} into the keyword store (run {run_id})")
+            else:
+                # An existing raw_keywords.csv is imported once if the store is still empty
+                run_id = store.snapshot(INPUT_FILE)
+        except Exception as e:
+            print(f"Error importing keywords: {e}")
+            return
+        if run_id is None:
+            print(f"Error: No mined keywords in {store.path} and no '{INPUT_FILE}'.")
+            print("Please run miner.py first to generate raw keywords.")
+            return
+
+        # Only keywords without a classification under the current rules are
+        # classified: new keywords, or everything after the rules changed.
+        print(f"Workers: {workers}, chunk size: {chunk_size}, rules {rules}")
+        clean_run = store.start_run('clean', rules=rules)
+        classified = 0
+        start = time.perf_counter()
+        for results in run_chunks(store.unclassified(rules, chunk_size), blacklist, workers):
+            store.save_classifications(results, rules)
+            classified += len(results)
+            elapsed = time.perf_counter() - start
+            print(f"\r  {classified} keywords classified, {classified / elapsed:,.0f} rows/s", end='', flush=True)
+        if classified:
+            print()
+        store.finish_run(clean_run, classified)
+        elapsed = time.perf_counter() - start
+
+        processed_count, filtered_count = store.classification_counts(run_id, rules)
+        try:
+            saved_count = store.export_tasks(output_file, run_id, rules) if processed_count > filtered_count else 0
+        except Exception as e:
+            print(f"Error saving to {output_file}: {e}")
+            return
 
-    # Write results
-    try:
-        if final_tasks:
-            fieldnames = ['Keyword', 'Intent', 'Source', 'Seed']
-            with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(final_tasks)
-            
-            print(f"Processing complete.")
-            print(f"Total processed: {processed_count}")
-            print(f"Filtered (Blacklist): {filtered_count}")
-            print(f"Saved to {OUTPUT_FILE}: {len(final_tasks)}")
-        else:
-            print("No valid keywords found after filtering.")
-            
-    except Exception as e:
-        print(f"Error saving to {OUTPUT_FILE}: {e}")
+    if saved_count:
+        print(f"Processing complete.")
+        print(f"Total processed: {processed_count}")
+        print(f"Filtered (Blacklist): {filtered_count}")
+        print(f"Newly classified keywords: {classified} ({elapsed:.2f}s, {classified / max(elapsed, 1e-9):,.0f} rows/s)")
+        print(f"Saved to {output_file}: {saved_count}")
+    else:
+        print("No valid keywords found after filtering.")
 
 if __name__ == "__main__":
     main()
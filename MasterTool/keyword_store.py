@@ -0,0 +1,348 @@
+"""
+SQLite keyword store shared by the MasterTool pipeline
+(miner.py -> cleaner.py -> analyzer.py). The CSV files are exports of it.
+
+    with KeywordStore() as store:
+        run_id = store.start_run('mine')
+        store.add_observations(run_id, [(keyword, source, seed), ...])
+        store.finish_run(run_id, rows)
+        store.export_raw('raw_keywords.csv', run_id)
+
+Tables:
+    runs             one row per stage run (mine / import / clean)
+    keywords         every distinct keyword string, with its kwcluster key
+    observations     keyword, source, seed, run and time of each mined result
+    classifications  intent per keyword (NULL = blacklisted), tagged with the
+                     fingerprint of the rules that produced it
+
+The latest finished `mine` (or `import`) run is the current snapshot; older
+runs stay as history. Work is incremental: cleaner.py only classifies
+keywords with no classification under the current rules fingerprint (new
+keywords, or all of them after blacklist.txt / INTENT_RULES change), and
+each stage reads through indexed queries instead of re-reading whole files.
+If the store has no snapshot yet, an existing raw_keywords.csv is imported
+(see snapshot()). KEYWORD_STORE_PATH overrides the database location.
+
+    python keyword_store.py stats
+    python keyword_store.py import some_dump.csv
+    python keyword_store.py export raw raw_keywords.csv [--run N]
+    python keyword_store.py export tasks final_tasks.csv
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Shared modules (kwcluster.py) live in the repo root
+sys.path.insert(0, os.path.dirname(BASE_DIR))
+from kwcluster import keyword_key
+
+DEFAULT_PATH = os.environ.get('KEYWORD_STORE_PATH') or os.path.join(BASE_DIR, 'keywords.sqlite')
+# Runs whose observations form a snapshot of mined keywords
+SNAPSHOT_STAGES = ('mine', 'import')
+BATCH_SIZE = 5000
+# Bound parameters per IN (...) lookup; older SQLite builds allow 999
+MAX_PARAMS = 500
+# SQLite page cache per connection
+CACHE_KB = 64 * 1024
+RAW_HEADER = ['Keyword', 'Source', 'Seed']
+TASKS_HEADER = ['Keyword', 'Intent', 'Source', 'Seed']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    stage TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    rows INTEGER NOT NULL DEFAULT 0,
+    rules TEXT
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    id INTEGER PRIMARY KEY,
+    keyword TEXT NOT NULL UNIQUE,
+    norm_key TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_keywords_norm ON keywords (norm_key);
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    keyword_id INTEGER NOT NULL REFERENCES keywords (id),
+    source TEXT NOT NULL,
+    seed TEXT NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_observations_keyword ON observations (keyword_id);
+CREATE INDEX IF NOT EXISTS idx_observations_seed ON observations (seed);
+CREATE INDEX IF NOT EXISTS idx_observations_run ON observations (run_id);
+CREATE TABLE IF NOT EXISTS classifications (
+    keyword_id INTEGER PRIMARY KEY REFERENCES keywords (id),
+    intent TEXT,
+    rules TEXT NOT NULL,
+    classified_at REAL NOT NULL
+);
+"""
+
+
+def _batches(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _write_csv(path, header, rows):
+    """Writes header + rows via a temp file; returns the number of rows."""
+    tmp_path = path + '.tmp'
+    count = 0
+    try:
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+
+class KeywordStore:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        # Bulk imports touch five indexes; the default 2 MB page cache thrashes past ~1M rows
+        self._db.execute(f'PRAGMA cache_size=-{CACHE_KB}')
+        self._db.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        self._db.execute('BEGIN')
+        try:
+            yield
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    # ---- runs ----
+
+    def start_run(self, stage, rules=None):
+        cursor = self._db.execute('INSERT INTO runs (stage, started_at, rules) VALUES (?, ?, ?)',
+                                  (stage, time.time(), rules))
+        return cursor.lastrowid
+
+    def finish_run(self, run_id, rows):
+        self._db.execute('UPDATE runs SET finished_at = ?, rows = ? WHERE id = ?', (time.time(), rows, run_id))
+
+    def latest_run(self, stages=SNAPSHOT_STAGES):
+        """Id of the newest finished run of one of `stages`, or None."""
+        placeholders = ', '.join('?' * len(stages))
+        row = self._db.execute(
+            f'SELECT id FROM runs WHERE stage IN ({placeholders}) AND finished_at IS NOT NULL '
+            'ORDER BY id DESC LIMIT 1', tuple(stages)).fetchone()
+        return row[0] if row else None
+
+    def runs(self):
+        return self._db.execute(
+            'SELECT id, stage, started_at, finished_at, rows, rules FROM runs ORDER BY id').fetchall()
+
+    # ---- observations ----
+
+    def _lookup_ids(self, keywords):
+        ids = {}
+        for i in range(0, len(keywords), MAX_PARAMS):
+            part = keywords[i:i + MAX_PARAMS]
+            placeholders = ', '.join('?' * len(part))
+            ids.update((kw, keyword_id) for keyword_id, kw in self._db.execute(
+                f'SELECT id, keyword FROM keywords WHERE keyword IN ({placeholders})', part))
+        return ids
+
+    def _keyword_ids(self, keywords, now):
+        """keyword -> id for a batch, inserting the new keywords and touching last_seen."""
+        keywords = list(keywords)
+        ids = self._lookup_ids(keywords)
+        known = list(ids.values())
+        for i in range(0, len(known), MAX_PARAMS):
+            part = known[i:i + MAX_PARAMS]
+            self._db.execute(f"UPDATE keywords SET last_seen = ? WHERE id IN ({', '.join('?' * len(part))})",
+                             [now] + part)
+        new = [kw for kw in keywords if kw not in ids]
+        if new:
+            # Only new keywords pay for normalization
+            self._db.executemany(
+                'INSERT INTO keywords (keyword, norm_key, first_seen, last_seen) VALUES (?, ?, ?, ?)',
+                ((kw, keyword_key(kw), now, now) for kw in new))
+            ids.update(self._lookup_ids(new))
+        return ids
+
+    def add_observations(self, run_id, rows):
+        """Stores (keyword, source, seed) rows for a run, in batches; returns the row count."""
+        count = 0
+        for batch in _batches(rows):
+            now = time.time()
+            with self._transaction():
+                ids = self._keyword_ids(dict.fromkeys(kw for kw, _, _ in batch), now)
+                self._db.executemany(
+                    'INSERT INTO observations (keyword_id, source, seed, run_id, observed_at) VALUES (?, ?, ?, ?, ?)',
+                    ((ids[kw], source, seed, run_id, now) for kw, source, seed in batch))
+            count += len(batch)
+        return count
+
+    def import_csv(self, path, stage='import'):
+        """Imports a raw_keywords.csv-style file (Keyword, Source, Seed) as a new snapshot run."""
+        run_id = self.start_run(stage)
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames:
+                raise ValueError(f"{path} is empty or not a CSV file")
+            rows = ((row['Keyword'].strip(), row.get('Source') or 'Unknown', row.get('Seed') or '')
+                    for row in reader if (row.get('Keyword') or '').strip())
+            count = self.add_observations(run_id, rows)
+        self.finish_run(run_id, count)
+        return run_id
+
+    def snapshot(self, csv_path=None):
+        """Current snapshot run; imports `csv_path` first if the store has none yet."""
+        run_id = self.latest_run()
+        if run_id is None and csv_path and os.path.exists(csv_path):
+            run_id = self.import_csv(csv_path)
+        return run_id
+
+    def observations(self, run_id):
+        """Yields (keyword, source, seed) for a run in insertion order."""
+        cursor = self._db.execute(
+            'SELECT k.keyword, o.source, o.seed FROM observations o JOIN keywords k ON k.id = o.keyword_id '
+            'WHERE o.run_id = ? ORDER BY o.id', (run_id,))
+        yield from cursor
+
+    def observation_counts(self, run_id):
+        """Yields (keyword, source, observations) per distinct pair of a run, in first-seen order."""
+        cursor = self._db.execute(
+            'SELECT k.keyword, o.source, COUNT(*) FROM observations o JOIN keywords k ON k.id = o.keyword_id '
+            'WHERE o.run_id = ? GROUP BY o.keyword_id, o.source ORDER BY MIN(o.id)', (run_id,))
+        yield from cursor
+
+    # ---- classifications ----
+
+    def unclassified(self, rules, batch_size=BATCH_SIZE):
+        """Yields batches of (keyword_id, keyword) with no classification under `rules`.
+
+        Pages by keyword id, so classifications can be saved between batches.
+        """
+        last_id = 0
+        while True:
+            batch = self._db.execute(
+                'SELECT k.id, k.keyword FROM keywords k LEFT JOIN classifications c ON c.keyword_id = k.id '
+                'WHERE k.id > ? AND (c.keyword_id IS NULL OR c.rules != ?) ORDER BY k.id LIMIT ?',
+                (last_id, rules, batch_size)).fetchall()
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1][0]
+
+    def save_classifications(self, rows, rules):
+        """Stores (keyword_id, intent) rows; intent None marks a blacklisted keyword."""
+        now = time.time()
+        with self._transaction():
+            self._db.executemany(
+                'INSERT OR REPLACE INTO classifications (keyword_id, intent, rules, classified_at) VALUES (?, ?, ?, ?)',
+                ((keyword_id, intent, rules, now) for keyword_id, intent in rows))
+
+    def classification_counts(self, run_id, rules):
+        """(observations in the run, observations whose keyword is blacklisted under `rules`)."""
+        return self._db.execute(
+            'SELECT COUNT(*), COALESCE(SUM(c.intent IS NULL), 0) FROM observations o '
+            'JOIN classifications c ON c.keyword_id = o.keyword_id AND c.rules = ? WHERE o.run_id = ?',
+            (rules, run_id)).fetchone()
+
+    # ---- exports ----
+
+    def export_raw(self, path, run_id):
+        """Writes a run's observations as raw_keywords.csv; returns the row count."""
+        return _write_csv(path, RAW_HEADER, self.observations(run_id))
+
+    def export_tasks(self, path, run_id, rules):
+        """Writes a run's non-blacklisted observations with their intent as final_tasks.csv."""
+        rows = self._db.execute(
+            'SELECT k.keyword, c.intent, o.source, o.seed FROM observations o '
+            'JOIN keywords k ON k.id = o.keyword_id '
+            'JOIN classifications c ON c.keyword_id = o.keyword_id AND c.rules = ? '
+            'WHERE o.run_id = ? AND c.intent IS NOT NULL ORDER BY o.id', (rules, run_id))
+        return _write_csv(path, TASKS_HEADER, rows)
+
+    def stats(self):
+        counts = {}
+        for table in ('runs', 'keywords', 'observations', 'classifications'):
+            counts[table] = self._db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        return counts
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect, import into and export from the keyword store")
+    parser.add_argument('--db', default=DEFAULT_PATH, help="SQLite database (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help="Table sizes and run history")
+    import_parser = commands.add_parser('import', help="Import a Keyword,Source,Seed CSV as a new snapshot")
+    import_parser.add_argument('csv')
+    export_parser = commands.add_parser('export', help="Export a snapshot as CSV")
+    export_parser.add_argument('kind', choices=['raw', 'tasks'])
+    export_parser.add_argument('csv')
+    export_parser.add_argument('--run', type=int, help="Snapshot run id (default: latest)")
+    args = parser.parse_args(argv)
+
+    with KeywordStore(args.db) as store:
+        if args.command == 'stats':
+            for table, count in store.stats().items():
+                print(f"{table:<16} {count}")
+            for run_id, stage, started, finished, rows, rules in store.runs():
+                state = time.strftime('%Y-%m-%d %H:%M', time.localtime(started)) if finished else 'unfinished'
+                print(f"  run {run_id:<5} {stage:<7} {rows:>9} rows  {state}" + (f"  rules {rules}" if rules else ''))
+            return 0
+
+        if args.command == 'import':
+            run_id = store.import_csv(args.csv)
+            print(f"Imported {args.csv} as run {run_id}")
+            return 0
+
+        run_id = args.run or store.latest_run()
+        if run_id is None:
+            print("No snapshot in the store yet; run miner.py or import a CSV first.")
+            return 1
+        if args.kind == 'raw':
+            count = store.export_raw(args.csv, run_id)
+        else:
+            clean_run = store.latest_run(('clean',))
+            if clean_run is None:
+                print("Nothing classified yet; run cleaner.py first.")
+                return 1
+            rules = next(run[5] for run in store.runs() if run[0] == clean_run)
+            count = store.export_tasks(args.csv, run_id, rules)
+        print(f"Exported {count} rows of run {run_id} to {args.csv}")
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
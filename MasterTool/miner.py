@@ -1,5 +1,5 @@
 # Dependencies:
-# pip install tqdm requests
+# pip install tqdm aiohttp (via httpclient.py)
 
 import warnings
 import os
@@ -8,15 +8,16 @@ import os
 warnings.filterwarnings("ignore")
 os.environ['PYTHONWARNINGS'] = 'ignore'
 
-import csv
 import sys
 import time
-import requests
+import asyncio
 import json
 import random
 import string
-import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import heapq
+import itertools
+import argparse
+from contextlib import AsyncExitStack
 from tqdm import tqdm
 from collections import defaultdict
 
@@ -24,12 +25,42 @@ from collections import defaultdict
 # 🔧 配置区域
 # ==========================================
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 共享模块 (httpclient.py, suggest_sources.py, suggest_cache.py, run_journal.py) 在仓库根目录
+sys.path.insert(0, os.path.dirname(BASE_DIR))
+from httpclient import NO_RETRY, AsyncHttpClient, HttpError, Metrics
+from suggest_sources import SOURCES
+from suggest_cache import SuggestionCache, normalize_query
+from textmatch import contains_chinese
+from run_journal import RunJournal
+from keyword_store import KeywordStore
 SEEDS_FILE = os.path.join(BASE_DIR, 'seeds.txt')
+# 结果写入关键词库 (keyword_store.py，保留每次运行的历史)，CSV 只是导出
 OUTPUT_FILE = os.path.join(BASE_DIR, 'raw_keywords.csv')
+# 断点日志: 每完成一个任务追加一行，中断后重跑自动续挖，全部完成后删除
+JOURNAL_FILE = os.path.join(BASE_DIR, 'mining_journal.jsonl')
 
-MAX_WORKERS = 8
-DELAY_MIN = 0.5
-DELAY_MAX = 1.0
+# 各来源的接口、解析、速率、并发和超时见 suggest_sources.py
+# 联想词缓存 (与 2_Database_Miner.py 共用): 有效期内重跑不再请求网络
+CACHE_TTL = 24 * 3600
+CACHE_MAX_ENTRIES = 200000
+LOCALE = 'zh-CN'
+
+# 查询扩展 (best-first): 产出新词多的前缀优先扩展，没有新词的前缀直接剪掉
+MAX_DEPTH = 2
+DEPTH_DECAY = 0.5
+# 默认查询预算 = 种子数 × 27，与旧的 "种子 + a~z" 网格请求量相同
+QUERIES_PER_SEED = 27
+CN_MODIFIERS = ['怎么', '教程', '怎么买', '是什么', '官网', '安全吗', '手续费', '提现', '充值', '下载']
+# 常见中文修饰词的拼音首字母 (用户常直接输入缩写)
+PINYIN_INITIALS = ['zc', 'xz', 'zm', 'jc', 'gw', 'sxf', 'yqm', 'tx', 'cz', 'aq']
+# 各类扩展的优先级权重
+EXPANSION_WEIGHTS = {
+    'modifier': 1.0,
+    'suggestion': 0.8,
+    'letter': 0.6,
+    'pinyin': 0.5,
+    'digit': 0.3,
+}
 
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -40,112 +71,328 @@ USER_AGENTS = [
 # 🛠️ 核心功能
 # ==========================================
 
-def contains_chinese(text):
-    """检查是否包含汉字"""
-    return bool(re.search(r'[\u4e00-\u9fa5]', text))
-
 def load_seeds():
     if not os.path.exists(SEEDS_FILE): return []
     with open(SEEDS_FILE, 'r', encoding='utf-8') as f:
         seeds = [line.strip() for line in f if line.strip()]
     return seeds
 
-def get_suggestions(url, params, source_name):
+class TokenBucket:
+    """
+    异步令牌桶：每个来源一个，替代每个线程各自 sleep。
+    rate = 每秒补充的令牌数，capacity = 允许的突发请求数。
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+CACHE = None
+# 各接口的请求数 / 错误 / 延迟 (运行结束时打印)
+HTTP_METRICS = Metrics()
+
+async def fetch_suggestions(source, client, limiter, query):
+    """
+    一个来源的一次查询。
+    注意：这里不做过滤，先把所有东西都挖回来；筛选放到最后统一处理，因为要对比各来源的结果。
+    """
+    # 命中缓存: 不占令牌，不发请求
+    if CACHE is not None:
+        cached = CACHE.get(source.name, query, LOCALE)
+        if cached is not None:
+            return cached
     try:
+        await limiter.acquire()
         headers = {'User-Agent': random.choice(USER_AGENTS)}
-        time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
-        response = requests.get(url, params=params, headers=headers, timeout=5)
-        if response.status_code == 200:
-            if source_name == 'Google':
-                data = response.json()
-                if len(data) > 1: return data[1]
-            elif source_name == 'Bing':
-                data = response.json()
-                if isinstance(data, list) and len(data) > 1: return data[1]
-                elif 'SearchSuggestions' in data: return [item['Query'] for item in data['SearchSuggestions']]
-    except:
+        response = await client.get(source.url, params=source.params(query, LOCALE), headers=headers)
+        if response.status == 200:
+            suggestions = source.parse(response.json())
+            # 只缓存成功的响应 (空列表也是有效结果)
+            if CACHE is not None:
+                CACHE.put(source.name, query, LOCALE, suggestions)
+            return suggestions
+    except (HttpError, ValueError, KeyError, TypeError):
         pass
-    return []
+    # 失败返回 None (区别于"没有联想词")，不会记为已完成
+    return None
 
-def mine_google(query):
-    # 保持全球中文环境
-    url = "http://suggestqueries.google.com/complete/search"
-    params = {'client': 'chrome', 'q': query, 'hl': 'zh-CN', 'ds': ''}
-    return get_suggestions(url, params, 'Google')
+async def mine_all(scheduler, sources, on_results, resume=None):
+    """
+    每个来源各有一组 worker、一个连接池和一个令牌桶，互不等待:
+    scheduler 按优先级发出的查询依次追加到共享的 issued 列表，每个来源按自己的速度
+    顺着列表往下挖；走到末尾的来源负责从 scheduler 取新查询，慢的来源只拖慢它自己。
+    on_results(task, 来源名, 联想词) 在每个 (查询, 来源) 完成时调用 (失败时联想词为 None)，
+    并可能产生新查询。resume: [(task, 已完成的来源名集合)]，上次只挖完部分来源的查询。
+    """
+    issued = list(resume or [])  # [(task, 已完成的来源名集合)]
+    cursors = {source.name: 0 for source in sources}
+    changed = asyncio.Condition()
+    in_flight = 0
+
+    async def next_task(name):
+        nonlocal in_flight
+        async with changed:
+            while True:
+                while cursors[name] < len(issued):
+                    task, done = issued[cursors[name]]
+                    cursors[name] += 1
+                    if name not in done:
+                        in_flight += 1
+                        return task
+                task = scheduler.pop()
+                if task is not None:
+                    issued.append((task, set()))
+                    changed.notify_all()
+                    continue
+                # 其它来源还有请求在跑或还没挖完: 等它们产出新的扩展
+                if in_flight == 0 and all(cursor == len(issued) for cursor in cursors.values()):
+                    changed.notify_all()
+                    return None
+                await changed.wait()
+
+    async def worker(source, client, limiter):
+        nonlocal in_flight
+        while (task := await next_task(source.name)) is not None:
+            try:
+                suggestions = await fetch_suggestions(source, client, limiter, task[0])
+            except Exception:
+                suggestions = None
+            on_results(task, source.name, suggestions)
+            async with changed:
+                in_flight -= 1
+                changed.notify_all()
 
-def mine_bing(query):
-    url = "https://api.bing.com/osjson.aspx"
-    params = {'query': query, 'mkt': 'zh-CN'}
-    return get_suggestions(url, params, 'Bing')
+    async with AsyncExitStack() as stack:
+        workers = []
+        for source in sources:
+            # 不在这里重试: 失败的请求不记入断点日志，下次运行自动补挖 (重试也不会绕过令牌桶)
+            client = await stack.enter_async_context(AsyncHttpClient(
+                headers={}, timeout=source.timeout, retry=NO_RETRY, pool_size=source.concurrency,
+                per_host=source.concurrency, metrics=HTTP_METRICS))
+            # 令牌桶必须在事件循环内创建 (asyncio.Lock)
+            limiter = TokenBucket(source.rate, source.burst)
+            workers += [worker(source, client, limiter) for _ in range(source.concurrency)]
+        await asyncio.gather(*workers)
+
+def task_id(task):
+    query, seed = task
+    return f"{seed}\t{query}"
 
-def mine_single_task(task):
+def parse_entry_id(entry_id):
+    """断点日志的 id 是 "种子\t查询\t来源"，返回 (task, 来源名)；旧格式返回 None"""
+    if entry_id.count('\t') < 2:
+        return None
+    tid, source_name = entry_id.rsplit('\t', 1)
+    seed, query = tid.split('\t', 1)
+    return (query, seed), source_name
+
+def compact(text):
+    return normalize_query(text).replace(' ', '')
+
+def expansions(query, seed, kind, new_keywords):
+    """一个有产出的查询的下一层候选: [(查询, 类型)]"""
+    topic = compact(seed.split()[0])
+    candidates = []
+    # 联想词的联想词 (只保留仍然和种子主题相关的)
+    for kw in new_keywords:
+        if topic in compact(kw):
+            candidates.append((kw, 'suggestion'))
+    for modifier in CN_MODIFIERS:
+        if modifier not in query:
+            candidates.append((f"{query} {modifier}", 'modifier'))
+    # 字母/数字/拼音首字母只加在完整的词后面，不在 "okx a" 后面再接 "b"
+    if kind in ('seed', 'suggestion', 'modifier'):
+        candidates += [(f"{query} {p}", 'pinyin') for p in PINYIN_INITIALS]
+        candidates += [(f"{query} {c}", 'letter') for c in string.ascii_lowercase]
+        candidates += [(f"{query} {d}", 'digit') for d in string.digits]
+    return candidates
+
+class ExpansionScheduler:
     """
-    注意：这里不再做过滤，而是先把所有东西都挖回来。
-    筛选逻辑放到最后统一处理，因为我们需要对比 Google 和 Bing 的结果。
+    Best-first 查询扩展调度器:
+    - 优先队列按 "父查询带来的新词数 × 扩展类型权重 × 深度衰减" 排序；
+    - 查询按归一化形式去重，同一个查询只会发一次；
+    - 没带来任何新词的查询 (包括种子本身) 不再扩展；
+    - 深度不超过 max_depth，总查询数不超过 budget。
     """
-    query, seed = task
-    results = []
-    
-    # 挖 Google
-    g_results = mine_google(query)
-    for kw in g_results:
-        results.append({'kw': kw, 'source': 'Google', 'seed': seed})
-        
-    # 挖 Bing
-    b_results = mine_bing(query)
-    for kw in b_results:
-        results.append({'kw': kw, 'source': 'Bing', 'seed': seed})
-        
-    return results
+    def __init__(self, seeds, budget, max_depth=MAX_DEPTH):
+        self.budget = budget
+        self.max_depth = max_depth
+        self.heap = []
+        self.counter = itertools.count()
+        self.seen = set()      # 已入队/已查询的归一化查询
+        self.done = set()      # 已完成的归一化查询 (断点恢复时跳过)
+        self.info = {}         # task_id -> (depth, kind)
+        self.keywords = set()  # 已挖到的归一化关键词
+        self.completed = set() # 至少一个来源已返回的 task_id
+        self.productive = set()
+        self.issued = 0
+        for seed in seeds:
+            self.push(seed, seed, 0, 'seed', float('inf'))
+
+    def push(self, query, seed, depth, kind, priority):
+        key = normalize_query(query)
+        if not key or key in self.seen:
+            return
+        self.seen.add(key)
+        heapq.heappush(self.heap, (-priority, next(self.counter), query, seed, depth, kind))
+
+    def pop(self):
+        while self.heap and self.issued < self.budget:
+            _, _, query, seed, depth, kind = heapq.heappop(self.heap)
+            if normalize_query(query) in self.done:
+                continue
+            self.issued += 1
+            self.info[task_id((query, seed))] = (depth, kind)
+            return (query, seed)
+        return None
 
-def get_suffixes():
-    suffixes = list(string.ascii_lowercase)
-    return suffixes
+    @property
+    def pruned(self):
+        return len(self.completed - self.productive)
+
+    def on_result(self, task, keywords):
+        """每个来源的结果到达时各调用一次，各自按带来的新词扩展"""
+        query, seed = task
+        depth, kind = self.info.get(task_id(task), (0, 'seed'))
+        self.done.add(normalize_query(query))
+        self.completed.add(task_id(task))
+        new = []
+        for kw in dict.fromkeys(keywords):
+            key = normalize_query(kw)
+            if key not in self.keywords:
+                self.keywords.add(key)
+                new.append(kw)
+        if not new:
+            # 没有新词: 剪枝，不再往下扩展
+            return
+        self.productive.add(task_id(task))
+        if depth >= self.max_depth:
+            return
+        base = len(new) * DEPTH_DECAY ** depth
+        for child, child_kind in expansions(query, seed, kind, new):
+            self.push(child, seed, depth + 1, child_kind, base * EXPANSION_WEIGHTS[child_kind])
+
+    def replay(self, task, depth, kind, keywords):
+        """断点恢复: 按日志顺序重放已完成的 (查询, 来源)，重建队列和去重集合"""
+        query, seed = task
+        if task_id(task) not in self.info:
+            self.seen.add(normalize_query(query))
+            self.issued += 1
+            self.info[task_id(task)] = (depth, kind)
+        self.on_result(task, keywords)
 
 def main():
+    parser = argparse.ArgumentParser(description="多来源联想词挖掘 (共识模式)")
+    parser.add_argument('--fresh', action='store_true', help="丢弃上次未完成的断点，从头开始")
+    parser.add_argument('--budget', type=int, help=f"最多查询次数 (默认 种子数 × {QUERIES_PER_SEED})")
+    parser.add_argument('--max-depth', type=int, default=MAX_DEPTH, help="最大扩展深度")
+    args = parser.parse_args()
+
     print("🚀 启动【智能共识】挖掘模式 (Consensus Mode)...")
-    print("🛡️  策略：保留中文 OR 保留(Google+Bing)共同推荐的英文热词")
+    source_names = [source.name for source in SOURCES]
+    print(f"🛡️  策略：保留中文 OR 保留至少两个来源 ({'+'.join(source_names)}) 共同推荐的英文热词")
     
     seeds = load_seeds()
     if not seeds:
         print("❌ seeds.txt 为空")
         return
 
-    # 1. 生成任务
-    suffixes = get_suffixes()
-    tasks = []
-    for seed in seeds:
-        tasks.append((seed, seed))
-        for suffix in suffixes:
-            tasks.append((f"{seed} {suffix}", seed))
-            
-    print(f"📋 任务数: {len(tasks)}")
-    
-    # 2. 临时存储所有数据 (用于对比)
-    # 格式: { "关键词": { "sources": {"Google", "Bing"}, "seed": "xxx" } }
-    temp_storage = defaultdict(lambda: {'sources': set(), 'seed': ''})
+    # 1. 任务调度: 从种子出发按产出动态扩展
+    budget = args.budget or len(seeds) * QUERIES_PER_SEED
+    scheduler = ExpansionScheduler(seeds, budget, max_depth=args.max_depth)
+    print(f"📋 查询预算: {budget} (最大深度 {args.max_depth})")
+
+    # 2. 挖掘结果先追加写入断点日志 (不在内存里堆积)
+    journal = RunJournal(JOURNAL_FILE)
+    if args.fresh:
+        journal.reset()
+    finished = defaultdict(set)  # task -> 已完成的来源名
+    for entry_id, payload in journal.entries():
+        parsed = parse_entry_id(entry_id)
+        if parsed is None:
+            continue
+        task, source_name = parsed
+        if task[1] in seeds and source_name in source_names:
+            scheduler.replay(task, payload['depth'], payload['kind'], payload['results'])
+            finished[task].add(source_name)
+    # 只挖完部分来源的查询: 其余来源接着挖
+    resume = [(task, done) for task, done in finished.items() if len(done) < len(source_names)]
+    if scheduler.issued:
+        print(f"♻️  从断点继续: 已完成 {scheduler.issued} 个查询 ({len(resume)} 个还缺部分来源)")
+    resumed_requests = sum(len(done) for done in finished.values())
     
     print("⏳ 正在全面挖掘 (先采集，后清洗)...")
+    started = time.perf_counter()
+    global CACHE
+    CACHE = SuggestionCache(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES)
+    failed = 0
     
-    with tqdm(total=len(tasks), desc="Mining", unit="task", ncols=100) as pbar:
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_task = {executor.submit(mine_single_task, task): task for task in tasks}
-            
-            for future in as_completed(future_to_task):
-                try:
-                    results = future.result()
-                    if results:
-                        for item in results:
-                            kw = item['kw']
-                            src = item['source']
-                            # 记录数据
-                            temp_storage[kw]['sources'].add(src)
-                            # 记录来源种子 (保留第一个遇到的即可)
-                            if not temp_storage[kw]['seed']:
-                                temp_storage[kw]['seed'] = item['seed']
-                    pbar.update(1)
-                except:
-                    pbar.update(1)
+    # 进度按 (查询, 来源) 计
+    with tqdm(total=budget * len(SOURCES), initial=resumed_requests, desc="Mining", unit="req", ncols=100) as pbar:
+        def collect(task, source_name, suggestions):
+            nonlocal failed
+            if suggestions is None:
+                # 不记入断点: 下次运行只重试这个来源
+                failed += 1
+            else:
+                depth, kind = scheduler.info.get(task_id(task), (0, 'seed'))
+                journal.record(f"{task_id(task)}\t{source_name}", {
+                    'depth': depth,
+                    'kind': kind,
+                    'results': suggestions,
+                })
+                scheduler.on_result(task, suggestions)
+            pbar.update(1)
+
+        try:
+            asyncio.run(mine_all(scheduler, SOURCES, collect, resume))
+        except KeyboardInterrupt:
+            print("\n⏸️  已中断，进度已保存，重新运行即可继续。")
+            return
+        finally:
+            journal.close()
+            stats = CACHE.stats
+            print(f"💾 缓存: 命中 {stats['hits']} / 未命中 {stats['misses']} (命中率 {CACHE.hit_rate():.0%})")
+            print(HTTP_METRICS.summary())
+            CACHE.close()
+            CACHE = None
+
+    elapsed = time.perf_counter() - started
+    ran = pbar.n - resumed_requests
+    print(f"⏱️  {ran} 个请求 ({len(SOURCES)} 个来源) 用时 {elapsed:.1f}s ({ran / max(elapsed, 1e-9):.1f} 请求/秒)")
+    print(f"🌱 {scheduler.issued} 次查询挖到 {len(scheduler.keywords)} 个不同关键词 "
+          f"(每次查询 {len(scheduler.keywords) / max(scheduler.issued, 1):.1f} 个)，剪枝 {scheduler.pruned} 个无产出前缀")
+
+    # 从断点日志重建全部结果 (包括之前几次运行完成的任务)
+    # 格式: { "关键词": { "sources": {"Google", "Bing"}, "seed": "xxx" } }
+    temp_storage = defaultdict(lambda: {'sources': set(), 'seed': ''})
+    for entry_id, payload in journal.entries():
+        parsed = parse_entry_id(entry_id)
+        if parsed is None:
+            continue
+        (_, seed), src = parsed
+        if seed not in seeds or src not in source_names: # seeds.txt / 来源改过，旧结果不再计入
+            continue
+        for kw in payload['results']:
+            # 记录数据
+            temp_storage[kw]['sources'].add(src)
+            # 记录来源种子 (保留第一个遇到的即可)
+            if not temp_storage[kw]['seed']:
+                temp_storage[kw]['seed'] = seed
 
     # 3. 核心清洗逻辑 (Smart Filtering)
     print(f"\n🧹 正在清洗数据 (原始数据量: {len(temp_storage)})...")
@@ -157,7 +404,7 @@ def main():
         
         # --- 你的核心策略 ---
         is_chinese = contains_chinese(kw)
-        is_consensus = ('Google' in sources and 'Bing' in sources) # 两个都有
+        is_consensus = len(sources) >= 2 # 至少两个来源都有
         
         should_keep = False
         
@@ -174,15 +421,21 @@ def main():
     print(f"✨ 清洗完成！保留了 {len(final_keywords)} 条【高价值】数据")
     print(f"🗑️  丢弃了 {len(temp_storage) - len(set(x[0] for x in final_keywords))} 条【单平台英文噪音】")
 
-    # 4. 保存
+    # 4. 保存: 写入关键词库 (新的一次运行)，再导出 CSV
     if final_keywords:
-        with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Keyword', 'Source', 'Seed'])
-            writer.writerows(final_keywords)
-        print(f"✅ 结果已保存至: {OUTPUT_FILE}")
+        with KeywordStore() as store:
+            run_id = store.start_run('mine')
+            store.add_observations(run_id, final_keywords)
+            store.finish_run(run_id, len(final_keywords))
+            store.export_raw(OUTPUT_FILE, run_id)
+        print(f"✅ 结果已写入关键词库 {store.path} (第 {run_id} 次运行)，并导出至: {OUTPUT_FILE}")
     else:
         print("⚠️ 未保留任何数据")
 
+    if failed:
+        print(f"⚠️ {failed} 个 (查询, 来源) 请求失败，断点已保留: 重新运行只会重试这些请求。")
+    else:
+        journal.finish()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
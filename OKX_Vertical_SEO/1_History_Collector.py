@@ -1,9 +1,13 @@
-import requests
 import json
 import os
 import re
+import sys
 from datetime import datetime
 
+# 共享模块 (httpclient.py) 在仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from httpclient import HttpClient, RetryPolicy
+
 # ================= 配置 =================
 DB_FILE = 'okx_database.json'  # 永久数据库
 HEADERS = {
@@ -16,6 +20,8 @@ HEADERS = {
 # OKX API
 API_SPOT = "https://www.okx.com/api/v5/public/instruments?instType=SPOT"
 API_NEWS = "https://www.okx.com/api/v5/support/announcements?limit=100" # 一次抓100条历史
+# 网络抖动 / 限流 (429、5xx) 时自动退避重试
+HTTP = HttpClient(headers=HEADERS, timeout=10, retry=RetryPolicy(retries=3, backoff=1.0))
 
 def load_db():
     if os.path.exists(DB_FILE):
@@ -59,7 +65,7 @@ def run_collector():
     # 1. 更新币种列表 (现货)
     print("   -> 同步 OKX 交易对...")
     try:
-        resp = requests.get(API_SPOT, headers=HEADERS, timeout=10)
+        resp = HTTP.get(API_SPOT)
         if resp.status_code == 200:
             for item in resp.json()['data']:
                 symbol = item['baseCcy']
@@ -77,7 +83,7 @@ def run_collector():
     # 2. 回溯历史公告 (抓取脉络)
     print("   -> 抓取 OKX 历史公告 (构建时间轴)...")
     try:
-        resp = requests.get(API_NEWS, headers=HEADERS, timeout=10)
+        resp = HTTP.get(API_NEWS)
         if resp.status_code == 200:
             # 修复：API 返回结构变更，数据在 data[0]['details'] 中
             api_resp = resp.json()
@@ -157,6 +163,7 @@ def run_collector():
 
     # 保存
     save_db(db)
+    print(HTTP.metrics.summary())
     print(f"✅ 数据库更新完毕！当前收录 {len(db['coins'])} 个币种，{len(db['news_history'])} 条历史脉络。")
     print("👉 请运行 2_Database_Miner.py")
 
@@ -1,66 +1,151 @@
-import requests
 import json
 import time
-import re
+import sys
 import os
+import threading
 import warnings
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 warnings.filterwarnings("ignore")
 
+# 共享模块 (httpclient.py, suggest_sources.py, suggest_cache.py, run_journal.py, kwcluster.py) 在仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from httpclient import NO_RETRY, HttpClient, Metrics
+from kwcluster import KeywordClusterer
+from suggest_sources import SOURCES
+from suggest_cache import SuggestionCache
+from textmatch import contains_chinese
+from run_journal import RunJournal
+
 DB_FILE = 'okx_database.json'
+# 断点日志: 每挖完一个币种追加一行，中断后重跑自动续挖，回写数据库后删除
+JOURNAL_FILE = 'okx_miner_journal.jsonl'
 HEADERS = {'User-Agent': 'Mozilla/5.0'}
+MAX_WORKERS = 10
+# 联想词缓存 (与 MasterTool/miner.py 共用)
+CACHE_TTL = 24 * 3600
+LOCALE = 'zh-CN'
+CACHE = None
+HTTP_METRICS = Metrics()
+
+
+class TokenBucket:
+    """线程安全的令牌桶: rate = 每秒请求数，capacity = 突发上限"""
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.rate)
+
+
+class SourcePool:
+    """
+    一个联想词来源独占的连接池、令牌桶和线程池 (并发数由来源声明)。
+    失败的币种由断点日志下次重试，这里不重试。
+    """
+    def __init__(self, source):
+        self.source = source
+        self.http = HttpClient(headers=HEADERS, timeout=source.timeout, retry=NO_RETRY,
+                               per_host=source.concurrency, metrics=HTTP_METRICS)
+        self.limiter = TokenBucket(source.rate, source.burst)
+        self.executor = ThreadPoolExecutor(max_workers=source.concurrency)
+
+    def fetch(self, query):
+        self.limiter.acquire()
+        r = self.http.get(self.source.url, params=self.source.params(query, LOCALE))
+        if r.status_code == 200:
+            return self.source.parse(r.json())
+        return None
+
+    def cached_suggestions(self, query):
+        """返回 (联想词列表, 是否发了网络请求)，请求失败时列表为 None"""
+        if CACHE is not None:
+            cached = CACHE.get(self.source.name, query, LOCALE)
+            if cached is not None:
+                return cached, False
+        try:
+            suggs = self.fetch(query)
+        except Exception:
+            suggs = None
+        # 只缓存成功的响应
+        if suggs is not None and CACHE is not None:
+            CACHE.put(self.source.name, query, LOCALE, suggs)
+        return suggs, True
+
+    def submit(self, query):
+        return self.executor.submit(self.cached_suggestions, query)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.http.close()
+
+
+POOLS = []
 
 def get_suggestions(query):
+    """各来源在自己的池里并行查询 (限速由各来源的令牌桶负责)。返回 (结果, 是否有来源请求失败)"""
     results = []
-    try: # Google
-        url = f"http://suggestqueries.google.com/complete/search?client=chrome&q={query}&hl=zh-CN"
-        r = requests.get(url, headers=HEADERS, timeout=2)
-        if r.status_code == 200:
-            suggs = json.loads(r.text)[1]
-            for w in suggs: results.append({'kw': w, 'src': 'Google'})
-    except: pass
-    try: # Bing
-        url = f"https://api.bing.com/qsonhs.aspx?q={query}&mkt=zh-CN"
-        r = requests.get(url, headers=HEADERS, timeout=2)
-        if r.status_code == 200:
-            data = r.json()
-            if 'AS' in data and 'Results' in data['AS']:
-                suggs = [item['Txt'] for item in data['AS']['Results'][0]['Suggests']]
-                for w in suggs: results.append({'kw': w, 'src': 'Bing'})
-    except: pass
-    return results
+    failed = False
+    futures = [(pool.source, pool.submit(query)) for pool in POOLS]
+    for source, future in futures:
+        suggs, _ = future.result()
+        if suggs is None:
+            failed = True
+            continue
+        for w in suggs: results.append({'kw': w, 'src': source.name, 'trusted': source.trusted})
+    return results, failed
+
+def score_keyword(kw):
+    score = 10
+    if "怎么买" in kw or "教程" in kw: score += 50
+    if "欧易" in kw: score += 30
+    return score
 
 def mine_coin(symbol):
     # 针对性探测
     seeds = [f"{symbol} 怎么买", f"{symbol} 价格", f"{symbol} 欧易"]
     
-    unique_kws = {}
-    heat = 0
+    # 归一化 + 近似重复聚类: "usdt怎么买" / "usdt 怎么买" / "usdt怎么购买" 只算一个词
+    clusterer = KeywordClusterer()
+    complete = True
     
     for seed in seeds:
-        suggs = get_suggestions(seed)
+        suggs, failed = get_suggestions(seed)
+        complete = complete and not failed
         for item in suggs:
             kw = item['kw']
             # 清洗
             if symbol.lower() not in kw.lower(): continue
-            has_chinese = bool(re.search(r'[\u4e00-\u9fa5]', kw))
+            has_chinese = contains_chinese(kw)
             
-            if has_chinese or item['src'] == 'Google': # Google 权重高
-                if kw not in unique_kws:
-                    score = 10
-                    if "怎么买" in kw or "教程" in kw: score += 50
-                    if "欧易" in kw: score += 30
-                    
-                    unique_kws[kw] = {
-                        'kw': kw,
-                        'src': item['src'],
-                        'score': score
-                    }
-                    heat += score
-        time.sleep(0.2)
+            if has_chinese or item['trusted']: # 高权重来源 (Google) 的英文词也保留
+                clusterer.add(kw, source=item['src'])
+
+    keywords = []
+    heat = 0
+    for cluster in clusterer.clusters():
+        # 任一写法命中加分词都算 (如 "usdt 怎么 买" 归一化后才命中 "怎么买")
+        score = max(score_keyword(form.replace(' ', '')) for form in cluster.variants)
+        keywords.append({
+            'kw': cluster.canonical,
+            'src': " + ".join(sorted(cluster.sources)),
+            'score': score
+        })
+        heat += score
         
-    return list(unique_kws.values()), heat
+    return keywords, heat, complete
 
 def run_miner():
     if not os.path.exists(DB_FILE): return
@@ -77,28 +162,68 @@ def run_miner():
     
     # 如果目标太多，截取前100个，防止跑太久
     targets = targets[:100]
+
+    # 上次中断时已挖完的币种直接跳过
+    journal = RunJournal(JOURNAL_FILE)
+    done = journal.completed_ids()
+    pending = [sym for sym in targets if sym not in done]
+    if done:
+        print(f"♻️  从断点继续: 已完成 {len(done)} 个")
     
-    print(f"⛏️  开始挖掘 {len(targets)} 个重点币种...")
+    print(f"⛏️  开始挖掘 {len(pending)} 个重点币种...")
     
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_sym = {executor.submit(mine_coin, sym): sym for sym in targets}
+    global CACHE, POOLS
+    CACHE = SuggestionCache(ttl=CACHE_TTL)
+    POOLS = [SourcePool(source) for source in SOURCES]
+    failed = 0
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        future_to_sym = {executor.submit(mine_coin, sym): sym for sym in pending}
         completed = 0
         for future in as_completed(future_to_sym):
             sym = future_to_sym[future]
             completed += 1
             try:
-                kws, heat = future.result()
-                # 更新数据库
+                kws, heat, complete = future.result()
+                if not complete:
+                    # 有请求失败: 不记入断点，下次重试
+                    failed += 1
+                    continue
+                journal.record(sym, {'keywords': kws, 'heat': heat})
                 if kws:
-                    db['coins'][sym]['keywords'] = kws
-                    db['coins'][sym]['heat_score'] = heat
-                    print(f"\r[{completed}/{len(targets)}] 更新: {sym} (热度 {heat})", end="")
-            except: pass
+                    print(f"\r[{completed}/{len(pending)}] 更新: {sym} (热度 {heat})", end="")
+            except Exception as e:
+                # 同样不记入断点: 计入失败，保留断点日志，下次重试
+                failed += 1
+                print(f"\n❌ {sym} 挖掘出错: {e}")
+    except KeyboardInterrupt:
+        print("\n⏸️  已中断，进度已保存，重新运行即可继续。")
+        return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        for pool in POOLS:
+            pool.shutdown()
+        journal.close()
+        stats = CACHE.stats
+        print(f"\n💾 缓存: 命中 {stats['hits']} / 未命中 {stats['misses']} (命中率 {CACHE.hit_rate():.0%})")
+        print(HTTP_METRICS.summary())
+        CACHE.close()
+        CACHE = None
+
+    # 从断点日志更新数据库 (包括之前几次运行完成的币种)
+    for sym, result in journal.entries():
+        if result['keywords'] and sym in db['coins']:
+            db['coins'][sym]['keywords'] = result['keywords']
+            db['coins'][sym]['heat_score'] = result['heat']
             
     # 保存回数据库
     with open(DB_FILE, 'w', encoding='utf-8') as f:
         json.dump(db, f, ensure_ascii=False, indent=2)
     print(f"\n✅ 挖掘完成！数据已回写至 {DB_FILE}")
+    if failed:
+        print(f"⚠️ {failed} 个币种请求失败，断点已保留: 重新运行只会重试这些币种。")
+    else:
+        journal.finish()
     print("👉 请运行 3_Analytics_Dashboard.py 生成全景大屏")
 
 if __name__ == "__main__":
@@ -1,12 +1,18 @@
-import requests
 import json
+import os
+import sys
+
+# 共享模块 (httpclient.py) 在仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from httpclient import HttpClient
 
 API_NEWS = "https://www.okx.com/api/v5/support/announcements?limit=5"
 HEADERS = {'User-Agent': 'Mozilla/5.0'}
+HTTP = HttpClient(headers=HEADERS, timeout=10)
 
 try:
     print("Requesting OKX API...")
-    resp = requests.get(API_NEWS, headers=HEADERS, timeout=10)
+    resp = HTTP.get(API_NEWS)
     print(f"Status Code: {resp.status_code}")
     if resp.status_code == 200:
         data = resp.json()
@@ -20,3 +26,4 @@ try:
         print(f"Error: {resp.text}")
 except Exception as e:
     print(f"Exception: {e}")
+print(HTTP.metrics.summary())
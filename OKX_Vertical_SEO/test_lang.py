@@ -1,5 +1,10 @@
-import requests
 import json
+import os
+import sys
+
+# 共享模块 (httpclient.py) 在仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from httpclient import HttpClient
 
 API_NEWS = "https://www.okx.com/api/v5/support/announcements?limit=5"
 HEADERS = {
@@ -8,10 +13,11 @@ HEADERS = {
     'x-locale': 'zh_CN',
     'x-utc': '8'
 }
+HTTP = HttpClient(headers=HEADERS, timeout=10)
 
 print("Testing OKX API for Chinese content...")
 try:
-    resp = requests.get(API_NEWS, headers=HEADERS, timeout=10)
+    resp = HTTP.get(API_NEWS)
     data = resp.json()
     
     # Check structure
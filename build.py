@@ -1,10 +1,13 @@
 import os
+import sys
 import glob
 import json
 from bs4 import BeautifulSoup
 import re
 import datetime
 
+from textmatch import PatternMatcher
+
 # Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 INDEX_PATH = os.path.join(BASE_DIR, 'index.html')
@@ -16,6 +19,10 @@ TODAY = datetime.date.today().strftime('%Y-%m-%d')
 LEGAL_DIR = os.path.join(BASE_DIR, 'legal')
 HELP_DIR = os.path.join(BASE_DIR, 'help')
 SITEMAP_PATH = os.path.join(BASE_DIR, 'sitemap.xml')
+SITE_URL = "https://join-ouyi.top"
+
+# Files whose content actually changed during this build (for --notify)
+CHANGED_FILES = set()
 
 # Icons & Categories
 # TODAY = datetime.now().strftime('%Y-%m-%d')
@@ -29,6 +36,16 @@ CATEGORY_ICONS = {
     'Web3': '<svg class="w-3 h-3" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19.428 15.428a2 2 0 00-1.022-.547l-2.384-.477a6 6 0 00-3.86.517l-.318.158a6 6 0 01-3.86.517L6.05 15.21a2 2 0 00-1.806.547M8 4h8l-1 1v5.172a2 2 0 00.586 1.414l5 5c1.26 1.26.367 3.414-1.415 3.414H4.828c-1.782 0-2.674-2.154-1.414-3.414l5-5A2 2 0 009 10.172V5L8 4z"></path></svg>'
 }
 
+# Blog category by title keywords; the first category in this order wins
+CATEGORY_KEYWORDS = {
+    'Security': ['安全', '风险', '冻结', '验证', '骗局', 'Safety'],
+    'Guide': ['注册', '开户', '入金', '下载', '教程', '指南', 'Guide'],
+    'Trading': ['手续费', '费率', '合约', '杠杆', '交易', 'Fee', 'Trading'],
+    'Tools': ['查询', '浏览器', '追踪', '工具', 'Query'],
+    'Review': ['对比', '评测', '评价', 'VS', '哪个好', 'Review']
+}
+CATEGORY_MATCHER = PatternMatcher(CATEGORY_KEYWORDS)
+
 def clean_link(href):
     if not href: return href
     if href.startswith('http'): return href
@@ -41,8 +58,21 @@ def read_file(path):
         return f.read()
 
 def write_file(path, content):
+    # Unchanged output is not rewritten, so mtimes (and the audit cache) stay valid
+    if os.path.exists(path) and read_file(path) == content:
+        return
     with open(path, 'w', encoding='utf-8') as f:
         f.write(content)
+    CHANGED_FILES.add(os.path.abspath(path))
+
+def page_url(path):
+    """Public clean URL of a built HTML file (index.html -> /, blog/fee.html -> /blog/fee)."""
+    rel = os.path.relpath(os.path.abspath(path), BASE_DIR).replace(os.sep, '/')
+    if rel == 'index.html':
+        return SITE_URL + '/'
+    if rel.endswith('/index.html'):
+        return f"{SITE_URL}/{rel[:-len('index.html')]}"
+    return f"{SITE_URL}/{rel[:-len('.html')]}"
 
 def get_favicons(soup):
     icons = []
@@ -90,20 +120,8 @@ def extract_blog_metadata():
             # Clean description
             desc = re.sub(r'\s*202[0-9]\s*', ' ', desc).strip()
             
-        # Determine Category
-        category = "Web3"
-        cat_keywords = {
-            'Security': ['安全', '风险', '冻结', '验证', '骗局', 'Safety'],
-            'Guide': ['注册', '开户', '入金', '下载', '教程', '指南', 'Guide'],
-            'Trading': ['手续费', '费率', '合约', '杠杆', '交易', 'Fee', 'Trading'],
-            'Tools': ['查询', '浏览器', '追踪', '工具', 'Query'],
-            'Review': ['对比', '评测', '评价', 'VS', '哪个好', 'Review']
-        }
-        
-        for cat, keywords in cat_keywords.items():
-            if any(k.lower() in title.lower() for k in keywords):
-                category = cat
-                break
+        # Determine Category (one pass over the title for all categories)
+        category = CATEGORY_MATCHER.first(title, CATEGORY_KEYWORDS) or "Web3"
 
         # Try to find date (schema or time tag)
         date = TODAY
@@ -159,7 +177,10 @@ def extract_blog_metadata():
     return posts
 
 def update_sitemap(posts):
-    """Update sitemap.xml with all blog posts, updating timestamps if changed."""
+    """
+    Update sitemap.xml with all blog posts, updating timestamps if changed.
+    Returns the locs that were added or got a new lastmod.
+    """
     print("Updating sitemap...")
     
     soup = None
@@ -185,6 +206,7 @@ def update_sitemap(posts):
     base_url = "https://join-ouyi.top"
     updated_count = 0
     added_count = 0
+    changed_locs = []
     
     for post in posts:
         full_url = f"{base_url}{post['url']}"
@@ -197,6 +219,7 @@ def update_sitemap(posts):
             if lastmod and lastmod.text != new_date:
                 lastmod.string = new_date
                 updated_count += 1
+                changed_locs.append(full_url)
         else:
             # Add new entry to soup (temporarily, for data collection)
             new_url_tag = soup.new_tag('url')
@@ -217,6 +240,7 @@ def update_sitemap(posts):
             # Update map to avoid adding duplicates if posts has duplicates
             existing_entries[full_url] = new_url_tag
             added_count += 1
+            changed_locs.append(full_url)
     
     # Now rebuild the list cleanly to handle deduplication and sorting
     url_data = []
@@ -309,6 +333,7 @@ def update_sitemap(posts):
     final_content = '\n'.join(xml_lines)
     write_file(SITEMAP_PATH, final_content)
     print("Sitemap file written.")
+    return changed_locs
 
 def update_index_blog_section(soup, posts):
     """Update the blog section in index.html with latest posts."""
@@ -1182,8 +1207,21 @@ def main():
     write_file(INDEX_PATH, str(index_soup))
     
     # 6. Update Sitemap
-    update_sitemap(posts)
-    
+    changed_locs = update_sitemap(posts)
+
+    # 7. Ping IndexNow endpoints with what this build changed (opt-in: only
+    # when the built site is what production serves, e.g. a deploy job).
+    # Runs in a detached process, so the build never waits on slow endpoints.
+    changed_urls = sorted({page_url(p) for p in CHANGED_FILES if p.endswith('.html')} | set(changed_locs))
+    if '--notify' in sys.argv[1:]:
+        from submit_indexnow import notify_in_background
+        if notify_in_background(changed_urls):
+            print(f"Notifying IndexNow endpoints about {len(changed_urls)} changed URLs in the background (see .indexnow_log.jsonl, errors in .indexnow_notify.err).")
+        else:
+            print("No changed URLs to notify.")
+    elif changed_urls:
+        print(f"{len(changed_urls)} URLs changed (run with --notify to ping IndexNow).")
+
     print("Build complete.")
 
 if __name__ == "__main__":
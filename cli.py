@@ -0,0 +1,131 @@
+"""
+Unified entry point for all site tools.
+
+    python cli.py build
+    python cli.py audit
+    python cli.py mine
+    python cli.py --timings analyze
+
+Every subcommand maps to an existing script and its entry function. The script
+is only imported once its subcommand has been chosen, so `python cli.py clean`
+never pays for bs4 / requests / tqdm. Use `--timings` to see how long the CLI
+itself and the selected module took to load, measured against STARTUP_BUDGET_MS;
+over budget, the run exits with EXIT_OVER_BUDGET (unless the command itself
+failed), so a reintroduced eager import fails CI.
+For a per-module breakdown run `python -X importtime cli.py <command>`.
+"""
+import time
+
+_START = time.perf_counter()
+
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Startup budget (ms) for dispatching a command: CLI import + loading the
+# selected tool module, excluding the time the tool itself runs.
+STARTUP_BUDGET_MS = 150
+EXIT_OVER_BUDGET = 3
+
+# command -> (script path relative to BASE_DIR, entry function, working dir, help)
+# The working dir matters: several scripts resolve their data files relative
+# to the current directory (okx_database.json, known_coins.json, seeds.txt).
+COMMANDS = {
+    'build': ('build.py', 'main', '.', 'Rebuild nav/footer, blog grid and sitemap.xml'),
+    'audit': ('audit.py', 'main', '.', 'Run the SEO audit over the site (or --crawl a server)'),
+    'serve': ('devserver.py', 'main', '.', "Serve the site locally with the host's URL rules"),
+    'standin': ('standin.py', 'main', '.', 'Replay recorded HTTP fixtures with injected latency/errors'),
+    'submit': ('submit_indexnow.py', 'submit_to_indexnow', '.', 'Push sitemap URLs to IndexNow'),
+    'mine': ('MasterTool/miner.py', 'main', 'MasterTool', 'Mine keyword suggestions from seeds.txt'),
+    'clean': ('MasterTool/cleaner.py', 'main', 'MasterTool', 'Classify new keywords, export final_tasks.csv'),
+    'store': ('MasterTool/keyword_store.py', 'main', 'MasterTool', 'Keyword store stats / CSV import and export'),
+    'analyze': ('MasterTool/analyzer.py', 'main', 'MasterTool', 'Generate SEO_Dashboard.html'),
+    'monitor': ('MasterTool/OKX_Flash_Monitor.py', 'main', 'MasterTool', 'Watch OKX for new spot listings'),
+    'collect': ('OKX_Vertical_SEO/1_History_Collector.py', 'run_collector', 'OKX_Vertical_SEO', 'Sync OKX coins and announcements'),
+    'dashboard': ('OKX_Vertical_SEO/3_Analytics_Dashboard.py', 'generate_dashboard', 'OKX_Vertical_SEO', 'Generate OKX_Full_Analytics.html'),
+}
+
+
+def print_usage():
+    print("Usage: python cli.py [--timings] <command> [args...]\n")
+    print("Commands:")
+    for name, (script, _, _, help_text) in COMMANDS.items():
+        print(f"  {name:<10} {help_text}  ({script})")
+
+
+def load_module(script):
+    """Imports a tool script by file path (handles names like 1_History_Collector.py)."""
+    import importlib.util
+
+    path = os.path.join(BASE_DIR, script)
+    module_name = os.path.splitext(os.path.basename(script))[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Scripts import their siblings (e.g. shared helpers) by plain name
+    script_dir = os.path.dirname(path)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def report_timings(cli_ms, module_ms, command):
+    """Prints the startup timings; returns False when they exceed STARTUP_BUDGET_MS."""
+    total = cli_ms + module_ms
+    within = total <= STARTUP_BUDGET_MS
+    print(f"[timings] cli {cli_ms:.1f} ms + {command} import {module_ms:.1f} ms "
+          f"= {total:.1f} ms (budget {STARTUP_BUDGET_MS} ms) {'OK' if within else 'OVER BUDGET'}", file=sys.stderr)
+    return within
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    show_timings = False
+    if argv and argv[0] == '--timings':
+        show_timings = True
+        argv = argv[1:]
+
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        print_usage()
+        if show_timings and not report_timings((time.perf_counter() - _START) * 1000, 0.0, 'help'):
+            return EXIT_OVER_BUDGET
+        return 0
+
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}\n")
+        print_usage()
+        return 2
+
+    script, func_name, workdir, _ = COMMANDS[command]
+    cli_ms = (time.perf_counter() - _START) * 1000
+
+    os.chdir(os.path.join(BASE_DIR, workdir))
+    # The scripts read their own options from sys.argv
+    sys.argv = [script] + args
+
+    t0 = time.perf_counter()
+    module = load_module(script)
+    module_ms = (time.perf_counter() - t0) * 1000
+
+    if not show_timings:
+        result = getattr(module, func_name)()
+        return result if isinstance(result, int) else 0
+
+    within = report_timings(cli_ms, module_ms, command)
+    try:
+        result = getattr(module, func_name)()
+    except SystemExit as e:
+        # argparse --help and scripts calling sys.exit(<code>) still get the budget check
+        if e.code is not None and not isinstance(e.code, int):
+            raise
+        result = e.code
+    code = result if isinstance(result, int) else 0
+    return EXIT_OVER_BUDGET if code == 0 and not within else code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# Dependencies:
+# pip install aiohttp (via httpclient.py)
+
+"""
+Asyncio crawler used by `audit.py --crawl <base_url>`.
+
+Starts from the URLs in the served sitemap.xml (falling back to the local
+file) plus the home page, then follows same-host links. It sees what the host
+really serves after _redirects, _headers and clean-URL rewriting: status codes,
+redirect chains, response sizes, headers and timing for every URL.
+
+Concurrency is bounded, URLs are deduplicated, and robots.txt is honored.
+Requests go through httpclient.AsyncHttpClient without retries, so every
+status is reported as the host first served it.
+Page facts come from the `extract_facts(html_text)` callable supplied by the
+caller, so the crawler itself has no opinion on SEO rules.
+"""
+import asyncio
+import time
+import urllib.parse
+import urllib.robotparser
+import xml.etree.ElementTree as ET
+
+from httpclient import NO_RETRY, AsyncHttpClient, HttpError, host_of
+
+USER_AGENT = 'Mozilla/5.0 (compatible; SEOAuditBot/1.0)'
+SITEMAP_NS = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+
+
+def url_key(url):
+    """Path + query of a URL; the identity used for dedupe and the link graph."""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path or '/'
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+class Crawler:
+    def __init__(self, base_url, extract_facts, concurrency=8, timeout=10, max_pages=5000,
+                 user_agent=USER_AGENT, respect_robots=True, ignore_url=None, local_sitemap=None):
+        self.base_url = base_url.rstrip('/')
+        self.host = urllib.parse.urlsplit(self.base_url).netloc
+        self.extract_facts = extract_facts
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.user_agent = user_agent
+        self.respect_robots = respect_robots
+        self.ignore_url = ignore_url or (lambda href: False)
+        self.local_sitemap = local_sitemap
+
+        self.robots = None
+        self.seen = set()
+        self.results = {}  # url_key -> result dict
+        self.external_links = set()  # (url, source url_key)
+        self.blocked = []  # url_keys skipped because of robots.txt
+        self.elapsed = 0.0
+        self.metrics = None
+
+    def absolute(self, key):
+        return self.base_url + key
+
+    def is_internal(self, url):
+        return urllib.parse.urlsplit(url).netloc == self.host
+
+    async def _fetch_text(self, client, url):
+        try:
+            response = await client.get(url)
+        except HttpError:
+            return None
+        return response.text if response.status == 200 else None
+
+    async def _load_robots(self, client):
+        self.robots = urllib.robotparser.RobotFileParser()
+        text = await self._fetch_text(client, self.absolute('/robots.txt'))
+        self.robots.parse((text or '').splitlines())
+
+    async def _sitemap_keys(self, client):
+        text = await self._fetch_text(client, self.absolute('/sitemap.xml'))
+        if text is None and self.local_sitemap:
+            try:
+                with open(self.local_sitemap, 'r', encoding='utf-8') as f:
+                    text = f.read()
+            except OSError:
+                text = None
+        if not text:
+            return []
+        try:
+            root = ET.fromstring(text.encode('utf-8'))
+        except ET.ParseError:
+            return []
+        # Production URLs are mapped onto the crawl base URL by path
+        return [url_key(loc.text.strip()) for loc in root.findall('ns:url/ns:loc', SITEMAP_NS) if loc.text]
+
+    def _allowed(self, key):
+        return not self.respect_robots or self.robots.can_fetch(self.user_agent, self.absolute(key))
+
+    @staticmethod
+    def _new_result(url):
+        return {'url': url, 'status': None, 'final_url': url, 'redirects': [], 'bytes': 0,
+                'elapsed_ms': 0.0, 'headers': {}, 'content_type': '', 'facts': None, 'links': [],
+                'error': None}
+
+    async def _fetch_page(self, client, key):
+        url = self.absolute(key)
+        started = time.perf_counter()
+        result = self._new_result(url)
+        try:
+            response = await client.get(url, allow_redirects=True, max_redirects=10)
+            body = response.content
+            result['status'] = response.status
+            result['final_url'] = response.url
+            result['redirects'] = response.history
+            result['bytes'] = len(body)
+            result['headers'] = dict(response.headers)
+            result['content_type'] = response.headers.get('Content-Type', '')
+        except HttpError as e:
+            result['error'] = e.reason
+            body = b''
+        result['elapsed_ms'] = (time.perf_counter() - started) * 1000
+
+        if body and 'html' in result['content_type'] and self.is_internal(result['final_url']):
+            try:
+                facts = self.extract_facts(body.decode('utf-8', errors='ignore'))
+            except Exception as e:
+                result['error'] = f"parse failed: {e}"
+                return result
+            result['facts'] = facts
+            for href, _rel in facts['links']:
+                href = href.strip()
+                if self.ignore_url(href):
+                    continue
+                target = urllib.parse.urljoin(result['final_url'], href)
+                target = urllib.parse.urldefrag(target)[0]
+                if not target.startswith(('http://', 'https://')):
+                    continue
+                if self.is_internal(target):
+                    result['links'].append(url_key(target))
+                else:
+                    self.external_links.add((target, key))
+        return result
+
+    async def _worker(self, client, queue):
+        while True:
+            key = await queue.get()
+            try:
+                try:
+                    result = await self._fetch_page(client, key)
+                except Exception as e:
+                    # A bug on one page must not kill the worker: if every worker died, queue.join() would hang
+                    result = self._new_result(self.absolute(key))
+                    result['error'] = f"crawl failed: {type(e).__name__}: {e}"
+                self.results[key] = result
+                for link in result['links']:
+                    self._enqueue(queue, link)
+            finally:
+                queue.task_done()
+
+    def _enqueue(self, queue, key):
+        if key in self.seen or len(self.seen) >= self.max_pages:
+            return
+        self.seen.add(key)
+        if not self._allowed(key):
+            self.blocked.append(key)
+            return
+        queue.put_nowait(key)
+
+    async def crawl(self):
+        started = time.perf_counter()
+        client = AsyncHttpClient(headers={'User-Agent': self.user_agent}, timeout=self.timeout, retry=NO_RETRY,
+                                 pool_size=self.concurrency, per_host=self.concurrency, endpoint_key=host_of)
+        self.metrics = client.metrics
+        async with client:
+            await self._load_robots(client)
+            queue = asyncio.Queue()
+            for key in ['/'] + await self._sitemap_keys(client):
+                self._enqueue(queue, key)
+
+            workers = [asyncio.create_task(self._worker(client, queue)) for _ in range(self.concurrency)]
+            await queue.join()
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        self.elapsed = time.perf_counter() - started
+        return self.results
+
+    def run(self):
+        return asyncio.run(self.crawl())
@@ -0,0 +1,143 @@
+"""
+Local static server that behaves like the production host.
+
+    python devserver.py [port]
+    python audit.py --crawl http://127.0.0.1:8000
+
+Unlike `python -m http.server`, it applies the same rules the host does:
+- clean URLs (/blog/fee -> blog/fee.html, /blog/ -> blog/index.html), with
+  /blog/fee.html and /blog redirected (308) to their canonical form;
+- the rules in _redirects (including /go/* splats);
+- the header blocks in _headers.
+Used as the stand-in for production when running the crawler in CI.
+"""
+import mimetypes
+import os
+import sys
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from audit import RouteTable
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IGNORE_DIRS = ['.git', 'node_modules', '__pycache__']
+
+
+def load_header_rules(root_dir):
+    """Parses _headers into [(url pattern, [(name, value)])]."""
+    rules = []
+    path = os.path.join(root_dir, '_headers')
+    if not os.path.exists(path):
+        return rules
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            if not line[0].isspace():
+                rules.append((line.strip(), []))
+            elif rules and ':' in line:
+                name, value = line.strip().split(':', 1)
+                rules[-1][1].append((name.strip(), value.strip()))
+    return rules
+
+
+def match_pattern(pattern, url_path):
+    if pattern.endswith('*'):
+        return url_path.startswith(pattern[:-1])
+    return url_path == pattern
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    routes = None
+    header_rules = []
+    root_dir = BASE_DIR
+
+    def log_message(self, format, *args):
+        pass
+
+    def _headers_for(self, url_path):
+        # Later blocks override earlier ones for the same header name
+        headers = {}
+        for pattern, values in self.header_rules:
+            if match_pattern(pattern, url_path):
+                for name, value in values:
+                    headers[name] = value
+        return headers
+
+    def _send(self, status, headers, body=b''):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _redirect(self, location, status, url_path):
+        headers = self._headers_for(url_path)
+        headers['Location'] = location
+        self._send(status, headers)
+
+    def _serve_file(self, rel_file, url_path, status=200):
+        with open(os.path.join(self.root_dir, rel_file), 'rb') as f:
+            body = f.read()
+        headers = self._headers_for(url_path)
+        content_type = mimetypes.guess_type(rel_file)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type.endswith(('xml', 'javascript', 'json')):
+            content_type += '; charset=utf-8'
+        headers['Content-Type'] = content_type
+        self._send(status, headers, body)
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        url_path = urllib.parse.unquote(parts.path) or '/'
+        query = f"?{parts.query}" if parts.query else ''
+
+        redirect = self.routes.match_redirect(url_path)
+        if redirect:
+            target, status = redirect
+            return self._redirect(target, status, url_path)
+
+        rel = url_path.lstrip('/')
+        # /blog/fee.html -> /blog/fee, /blog/index.html -> /blog/
+        if rel.endswith('.html') and rel in self.routes.files:
+            clean = '/' + rel[:-len('.html')]
+            if clean.endswith('/index') or clean == '/index':
+                clean = clean[:-len('index')]
+            return self._redirect(clean + query, 308, url_path)
+        # /blog -> /blog/ when it is a directory index
+        if rel and not rel.endswith('/') and os.path.join(rel, 'index.html') in self.routes.files \
+                and f"{rel}.html" not in self.routes.files:
+            return self._redirect(url_path + '/' + query, 308, url_path)
+
+        found, rel_file, _ = self.routes.lookup(rel)
+        if found and rel_file:
+            return self._serve_file(rel_file, url_path)
+        if '404.html' in self.routes.files:
+            return self._serve_file('404.html', url_path, status=404)
+        self._send(404, self._headers_for(url_path), b'Not Found')
+
+    do_HEAD = do_GET
+
+
+def make_server(root_dir=BASE_DIR, host='127.0.0.1', port=8000):
+    handler = type('Handler', (SiteHandler,), {
+        'root_dir': root_dir,
+        'routes': RouteTable(root_dir, IGNORE_DIRS),
+        'header_rules': load_header_rules(root_dir),
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    server = make_server(os.getcwd(), port=port)
+    print(f"Serving {os.getcwd()} at http://127.0.0.1:{server.server_port} (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
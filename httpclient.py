@@ -0,0 +1,413 @@
+# Dependencies:
+# pip install requests aiohttp
+
+"""
+Shared HTTP client layer used by every tool that talks to the network
+(audit/linkcheck/crawler, submit_indexnow, the miners, the OKX collectors).
+
+    client = HttpClient(retry=RetryPolicy(retries=2))
+    resp = client.get(url, params={'q': query}, timeout=5)
+    resp.status_code, resp.text, resp.json()
+    print(client.metrics.summary())
+
+    async with AsyncHttpClient(pool_size=8, per_host=4) as client:
+        resp = await client.get(url)
+
+Both clients provide:
+- pooled keep-alive connections, with a cap on concurrent connections per host;
+- a RetryPolicy: exponential backoff on network errors, 429 and 5xx, honoring
+  Retry-After;
+- an optional in-memory GET cache (cache_ttl, per client or per request);
+- per-endpoint metrics: requests, errors, retries, cache hits, p50/p95 latency.
+
+Non-2xx responses are returned like requests does; only a network failure
+that survives every retry raises HttpError. requests and aiohttp are imported
+lazily, so importing this module costs nothing at CLI startup.
+
+Two environment variables switch every client to offline work (see standin.py):
+HTTP_RECORD=<file> appends each final response to a fixture file, and
+HTTP_STANDIN=<base url> sends every request to the local stand-in server.
+"""
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from collections import Counter, defaultdict
+
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+# Latency samples kept per endpoint for the percentiles
+MAX_SAMPLES = 10000
+
+
+class HttpError(Exception):
+    """Network failure (connection, timeout, ...) after all retries."""
+
+    def __init__(self, url, cause):
+        self.url = url
+        self.cause = cause
+        self.reason = str(cause) or type(cause).__name__
+        super().__init__(f"{url}: {self.reason}")
+
+
+class RetryPolicy:
+    def __init__(self, retries=2, backoff=0.5, max_backoff=30.0, retry_status=RETRY_STATUS,
+                 jitter=0.1, on_retry=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_status = retry_status
+        self.jitter = jitter
+        # on_retry(attempt, status_or_error, wait_seconds), e.g. for progress output
+        self.on_retry = on_retry
+
+    def delay(self, attempt, retry_after=None):
+        if retry_after and retry_after.strip().isdigit():
+            return min(float(retry_after), self.max_backoff)
+        wait = min(self.backoff * (2 ** attempt), self.max_backoff)
+        return wait * (1 + random.uniform(0, self.jitter))
+
+
+NO_RETRY = RetryPolicy(retries=0)
+
+
+class Response:
+    """Fully read response, identical for the sync and async clients."""
+
+    def __init__(self, status, headers, content, url, history=(), elapsed=0.0, from_cache=False):
+        self.status = status
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.history = list(history)  # [(status, url)] of redirects followed
+        self.elapsed = elapsed
+        self.from_cache = from_cache
+
+    @property
+    def status_code(self):
+        return self.status
+
+    @property
+    def ok(self):
+        return self.status < 400
+
+    @property
+    def encoding(self):
+        content_type = self.headers.get('Content-Type', '')
+        for part in content_type.split(';')[1:]:
+            name, _, value = part.strip().partition('=')
+            if name.lower() == 'charset' and value:
+                return value.strip('"\'')
+        return 'utf-8'
+
+    @property
+    def text(self):
+        try:
+            return self.content.decode(self.encoding, errors='replace')
+        except LookupError:
+            return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class Metrics:
+    """Per-endpoint counters and latency samples. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = defaultdict(lambda: {
+            'requests': 0, 'errors': 0, 'retries': 0, 'cache_hits': 0,
+            'statuses': Counter(), 'latencies': [],
+        })
+
+    def record(self, endpoint, elapsed, status=None, error=None):
+        with self._lock:
+            entry = self.endpoints[endpoint]
+            entry['requests'] += 1
+            if error is not None:
+                entry['errors'] += 1
+                entry['statuses'][error] += 1
+            else:
+                entry['statuses'][status] += 1
+                if status >= 400:
+                    entry['errors'] += 1
+            if len(entry['latencies']) < MAX_SAMPLES:
+                entry['latencies'].append(elapsed)
+
+    def count(self, endpoint, field):
+        with self._lock:
+            self.endpoints[endpoint][field] += 1
+
+    def total(self, field):
+        with self._lock:
+            return sum(entry[field] for entry in self.endpoints.values())
+
+    @staticmethod
+    def percentile(samples, q):
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: {
+                    'requests': e['requests'], 'errors': e['errors'], 'retries': e['retries'],
+                    'cache_hits': e['cache_hits'], 'statuses': dict(e['statuses']),
+                    'p50_ms': self.percentile(e['latencies'], 0.5) * 1000,
+                    'p95_ms': self.percentile(e['latencies'], 0.95) * 1000,
+                }
+                for endpoint, e in self.endpoints.items()
+            }
+
+    def brief(self):
+        """One-line total over all endpoints."""
+        with self._lock:
+            latencies = [t for e in self.endpoints.values() for t in e['latencies']]
+            totals = {field: sum(e[field] for e in self.endpoints.values())
+                      for field in ('requests', 'errors', 'retries', 'cache_hits')}
+        return (f"HTTP: {totals['requests']} requests to {len(self.endpoints)} endpoints, "
+                f"{totals['errors']} errors, {totals['retries']} retries, {totals['cache_hits']} cache hits, "
+                f"p50 {self.percentile(latencies, 0.5) * 1000:.0f} ms, p95 {self.percentile(latencies, 0.95) * 1000:.0f} ms")
+
+    def summary(self, limit=20):
+        rows = sorted(self.snapshot().items(), key=lambda x: -x[1]['requests'])
+        if not rows:
+            return "HTTP: no requests"
+        width = min(60, max(len(endpoint) for endpoint, _ in rows[:limit]))
+        lines = [f"{'endpoint':<{width}} {'reqs':>6} {'err':>5} {'retry':>5} {'cache':>5} {'p50ms':>7} {'p95ms':>7}"]
+        for endpoint, m in rows[:limit]:
+            lines.append(f"{endpoint[:width]:<{width}} {m['requests']:>6} {m['errors']:>5} {m['retries']:>5} "
+                         f"{m['cache_hits']:>5} {m['p50_ms']:>7.0f} {m['p95_ms']:>7.0f}")
+        if len(rows) > limit:
+            lines.append(f"... {len(rows) - limit} more endpoints")
+        return '\n'.join(lines)
+
+
+def endpoint_of(method, url):
+    """Default metrics key: method + host + path (query string dropped)."""
+    parts = urllib.parse.urlsplit(url)
+    return f"{method} {parts.netloc}{parts.path}"
+
+
+def host_of(method, url):
+    return urllib.parse.urlsplit(url).netloc
+
+
+class _ResponseCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entries = {}
+
+    @staticmethod
+    def key(url, params):
+        return url, tuple(sorted((params or {}).items()))
+
+    def get(self, key, ttl):
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry and time.monotonic() - entry[0] <= ttl:
+            return entry[1]
+        return None
+
+    def put(self, key, response):
+        with self._lock:
+            self.entries[key] = (time.monotonic(), response)
+
+
+class _BaseClient:
+    def __init__(self, headers=None, timeout=10, retry=None, pool_size=32, per_host=8,
+                 cache_ttl=None, metrics=None, endpoint_key=endpoint_of):
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.pool_size = pool_size
+        self.per_host = per_host
+        self.cache_ttl = cache_ttl
+        self.cache = _ResponseCache()
+        self.metrics = metrics or Metrics()
+        self.endpoint_key = endpoint_key
+        self.standin = os.environ.get('HTTP_STANDIN', '').rstrip('/') or None
+        self.recorder = None
+        if os.environ.get('HTTP_RECORD') and not self.standin:
+            from standin import open_recorder
+            self.recorder = open_recorder(os.environ['HTTP_RECORD'])
+
+    def _target(self, url):
+        """https://host/path?q -> <standin>/host/path?q in stand-in mode."""
+        if not self.standin:
+            return url
+        parts = urllib.parse.urlsplit(url)
+        return f"{self.standin}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+
+    def _record(self, method, url, params, json_body, data, response):
+        from standin import fixture_key
+
+        body = json.dumps(json_body) if json_body is not None else data
+        if isinstance(body, dict):
+            body = urllib.parse.urlencode(body)
+        self.recorder.record(fixture_key(method, url, params, body), response.status, response.headers,
+                             response.content)
+
+    def _cached(self, method, url, params, cache_ttl, endpoint):
+        ttl = self.cache_ttl if cache_ttl is None else cache_ttl
+        if method != 'GET' or not ttl:
+            return None, None
+        key = self.cache.key(url, params)
+        response = self.cache.get(key, ttl)
+        if response is not None:
+            self.metrics.count(endpoint, 'cache_hits')
+        return key, response
+
+    def _retry_wait(self, retry, attempt, endpoint, outcome, retry_after=None):
+        wait = retry.delay(attempt, retry_after)
+        self.metrics.count(endpoint, 'retries')
+        if retry.on_retry:
+            retry.on_retry(attempt + 1, outcome, wait)
+        return wait
+
+
+class HttpClient(_BaseClient):
+    """Blocking client on a pooled requests.Session (safe to share between threads)."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._exceptions = requests.RequestException
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # pool_block caps concurrent connections per host at per_host
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.per_host, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method, url, params=None, headers=None, json=None, data=None, timeout=None,
+                retry=None, cache_ttl=None, allow_redirects=True):
+        retry = retry or self.retry
+        endpoint = self.endpoint_key(method, url)
+        cache_key, cached = self._cached(method, url, params, cache_ttl, endpoint)
+        if cached is not None:
+            return cached
+
+        for attempt in range(retry.retries + 1):
+            started = time.perf_counter()
+            try:
+                r = self.session.request(method, self._target(url), params=params, headers=headers, json=json, data=data,
+                                         timeout=timeout or self.timeout, allow_redirects=allow_redirects)
+            except self._exceptions as e:
+                self.metrics.record(endpoint, time.perf_counter() - started, error=type(e).__name__)
+                if attempt < retry.retries:
+                    time.sleep(self._retry_wait(retry, attempt, endpoint, str(e) or type(e).__name__))
+                    continue
+                raise HttpError(url, e) from e
+            elapsed = time.perf_counter() - started
+            self.metrics.record(endpoint, elapsed, status=r.status_code)
+            if r.status_code in retry.retry_status and attempt < retry.retries:
+                time.sleep(self._retry_wait(retry, attempt, endpoint, r.status_code, r.headers.get('Retry-After')))
+                continue
+            response = Response(r.status_code, r.headers, r.content, r.url,
+                                [(h.status_code, h.url) for h in r.history], elapsed)
+            if cache_key is not None and response.status == 200:
+                self.cache.put(cache_key, response)
+            if self.recorder is not None:
+                self._record(method, url, params, json, data, response)
+            return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncHttpClient(_BaseClient):
+    """asyncio client on one pooled aiohttp session. Use as `async with`."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.session = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        self._aiohttp = aiohttp
+        connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.per_host)
+        self.session = aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                             timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def request(self, method, url, params=None, headers=None, json=None, data=None, timeout=None,
+                      retry=None, cache_ttl=None, allow_redirects=True, max_redirects=10, read_body=True):
+        import asyncio
+
+        aiohttp = self._aiohttp
+        retry = retry or self.retry
+        endpoint = self.endpoint_key(method, url)
+        cache_key, cached = self._cached(method, url, params, cache_ttl, endpoint)
+        if cached is not None:
+            return cached
+
+        options = {'allow_redirects': allow_redirects, 'max_redirects': max_redirects}
+        # timeout=None would mean "no timeout" to aiohttp; leave it out so the session's total applies
+        if timeout:
+            options['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        for attempt in range(retry.retries + 1):
+            started = time.perf_counter()
+            try:
+                async with self.session.request(method, self._target(url), params=params, headers=headers, json=json, data=data,
+                                                **options) as r:
+                    if read_body:
+                        content = await r.read()
+                    else:
+                        # Only the status matters (e.g. link checks); don't download the body
+                        content = b''
+                        r.release()
+                    status, response_headers, final_url = r.status, r.headers, str(r.url)
+                    history = [(h.status, str(h.url)) for h in r.history]
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.metrics.record(endpoint, time.perf_counter() - started, error=type(e).__name__)
+                if attempt < retry.retries:
+                    await asyncio.sleep(self._retry_wait(retry, attempt, endpoint, str(e) or type(e).__name__))
+                    continue
+                raise HttpError(url, e) from e
+            elapsed = time.perf_counter() - started
+            self.metrics.record(endpoint, elapsed, status=status)
+            if status in retry.retry_status and attempt < retry.retries:
+                await asyncio.sleep(self._retry_wait(retry, attempt, endpoint, status, response_headers.get('Retry-After')))
+                continue
+            response = Response(status, response_headers, content, final_url, history, elapsed)
+            if cache_key is not None and status == 200:
+                self.cache.put(cache_key, response)
+            if self.recorder is not None and read_body:
+                self._record(method, url, params, json, data, response)
+            return response
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        return await self.request('HEAD', url, **kwargs)
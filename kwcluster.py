@@ -0,0 +1,194 @@
+"""
+Keyword normalization and near-duplicate clustering for the keyword tools
+(MasterTool/analyzer.py, OKX_Vertical_SEO/2_Database_Miner.py).
+
+    clusterer = KeywordClusterer()
+    for row in rows:
+        clusterer.add(row['Keyword'], source=row['Source'])
+    for cluster in clusterer.clusters():
+        print(cluster.canonical, cluster.count, cluster.sources, cluster.variants)
+
+Two stages:
+
+1. Exact: every keyword is reduced to a key (NFKC, casefold, whitespace and
+   punctuation dropped), so "usdt怎么买", "USDT 怎么买" and "ｕｓｄｔ 怎么买？" are
+   one entry. This is a dict lookup per observation.
+2. Near-duplicate: keys are grouped when their insert/delete edit distance is
+   small relative to their length (similarity = 1 - distance / longer length,
+   default threshold 0.85) and the edits only insert or delete non-Latin
+   characters, so Latin words and numbers stay identical. "usdt怎么买",
+   "usdt币怎么买" and "usdt怎么购买" merge; "usdt怎么卖" (a
+   substitution costs two edits), "usd怎么买" and "magic8价格" vs "magic7价格"
+   (different tickers / models) do not.
+
+Keywords are a handful of characters, too short for stable MinHash estimates
+(see minhash.py for page-level duplicates), so candidates come from a
+deletion-neighbourhood index instead: two keys within k edits share a
+string obtained by deleting at most k (non-Latin) characters from each,
+within the same Latin-token signature. Only cluster centres are indexed,
+and keys are visited heaviest first, each joining its most similar centre.
+Clusters therefore never chain through intermediate variants, and the most
+observed form becomes the centre.
+"""
+import re
+import unicodedata
+from collections import Counter
+
+DEFAULT_THRESHOLD = 0.85
+# Upper bound on edits considered; keeps the deletion neighbourhood small
+MAX_EDITS = 2
+LATIN_TOKEN_RE = re.compile(r'[0-9a-z]+')
+
+
+def normalize_keyword(text):
+    """NFKC + casefold with runs of whitespace collapsed; the display form of a keyword."""
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def keyword_key(text):
+    """Exact-match key: the normalized keyword with whitespace and punctuation removed."""
+    normalized = normalize_keyword(text)
+    key = ''.join(ch for ch in normalized if ch.isalnum())
+    # All-punctuation keywords still need a key of their own
+    return key or normalized
+
+
+def edit_distance(a, b):
+    """Insert/delete edit distance (len(a) + len(b) - 2 * LCS)."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = [0] * (len(b) + 1)
+    for ch in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if ch == other else max(previous[j + 1], current[j]))
+        previous = current
+    return len(a) + len(b) - 2 * previous[-1]
+
+
+def similarity(a, b):
+    """1 - edit distance / length of the longer key."""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    return 1 - edit_distance(a, b) / longest
+
+
+class KeywordCluster:
+    def __init__(self, key):
+        self.key = key              # key of the centre
+        self.members = {}           # key -> Counter of display forms
+        self.sources = set()
+        self.count = 0
+        self.score = 0
+
+    def add(self, key, entry):
+        self.members[key] = entry['forms']
+        self.sources |= entry['sources']
+        self.count += entry['count']
+        self.score += entry['score']
+
+    @property
+    def variants(self):
+        """Every display form in the cluster -> observations."""
+        variants = Counter()
+        for forms in self.members.values():
+            variants.update(forms)
+        return variants
+
+    @property
+    def canonical(self):
+        """Most observed display form of the centre key (shorter, then alphabetical, on ties)."""
+        forms = self.members[self.key]
+        return min(forms, key=lambda form: (-forms[form], len(form), form))
+
+    def __repr__(self):
+        return f"KeywordCluster({self.canonical!r}, count={self.count}, keys={len(self.members)})"
+
+
+class KeywordClusterer:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, max_edits=MAX_EDITS):
+        self.threshold = threshold
+        self.max_edits = max_edits
+        self._entries = {}  # key -> {'forms': Counter, 'sources': set, 'count': int, 'score': total score}
+
+    def add(self, keyword, source=None, score=0, count=1):
+        """Records `count` observations of `keyword`, each worth `score`; returns its key ('' for blank keywords)."""
+        form = normalize_keyword(keyword)
+        if not form:
+            return ''
+        key = keyword_key(form)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = {'forms': Counter(), 'sources': set(), 'count': 0, 'score': 0}
+        entry['forms'][form] += count
+        if source:
+            entry['sources'].add(source)
+        entry['count'] += count
+        entry['score'] += score * count
+        return key
+
+    def __len__(self):
+        """Number of distinct keys (after exact normalization)."""
+        return len(self._entries)
+
+    def _allowed_edits(self, length):
+        return min(self.max_edits, int((1 - self.threshold) * length + 1e-9))
+
+    @staticmethod
+    def _deletions(key, edits):
+        """`key` plus every string left after deleting up to `edits` non-Latin characters.
+
+        Latin words and numbers have to match exactly anyway, so they are never deleted.
+        """
+        variants = {key}
+        frontier = {key}
+        for _ in range(edits):
+            frontier = {s[:i] + s[i + 1:] for s in frontier for i, ch in enumerate(s)
+                        if not ('0' <= ch <= '9' or 'a' <= ch <= 'z')}
+            frontier.discard('')
+            variants |= frontier
+        return variants
+
+    def clusters(self):
+        """Returns KeywordClusters, heaviest first; every key belongs to exactly one."""
+        entries = self._entries
+        order = sorted(entries, key=lambda k: (-entries[k]['count'], -entries[k]['score'], len(k), k))
+        index = {}    # (latin tokens, deletion variant) -> centre keys
+        centres = {}  # centre key -> (rank, cluster)
+        for key in order:
+            # A partner can be up to max_edits longer, which may allow more edits than len(key) alone
+            edits = self._allowed_edits(len(key) + self.max_edits)
+            tokens = tuple(LATIN_TOKEN_RE.findall(key))
+            variants = [(tokens, variant) for variant in self._deletions(key, edits)]
+            best = None
+            if edits:
+                candidates = {centre for variant in variants for centre in index.get(variant, ())}
+                for centre in candidates:
+                    sim = similarity(key, centre)
+                    if sim < self.threshold:
+                        continue
+                    # Most similar centre wins; on ties the heavier (earlier) one
+                    rank = (-sim, centres[centre][0])
+                    if best is None or rank < best[0]:
+                        best = (rank, centre)
+            if best is None:
+                cluster = KeywordCluster(key)
+                centres[key] = (len(centres), cluster)
+                for variant in variants:
+                    index.setdefault(variant, []).append(key)
+            else:
+                cluster = centres[best[1]][1]
+            cluster.add(key, entries[key])
+
+        result = [cluster for _, cluster in centres.values()]
+        result.sort(key=lambda c: (-c.count, -c.score, c.key))
+        return result
+
+
+def cluster_keywords(keywords, threshold=DEFAULT_THRESHOLD):
+    """Convenience wrapper: clusters a plain iterable of keyword strings."""
+    clusterer = KeywordClusterer(threshold)
+    for keyword in keywords:
+        clusterer.add(keyword)
+    return clusterer.clusters()
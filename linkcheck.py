@@ -0,0 +1,120 @@
+# Dependencies:
+# pip install aiohttp (via httpclient.py)
+
+"""
+Asyncio external link checker used by audit.py.
+
+- One pooled httpclient.AsyncHttpClient; connections are reused per host and
+  capped by `per_host` so we stay polite to any single site.
+- HEAD first, falling back to GET for servers that reject HEAD.
+- Retries with exponential backoff on timeouts, connection errors, 429 and 5xx
+  (httpclient.RetryPolicy); per-host latency/error metrics in `self.metrics`.
+- Results are cached on disk by URL with a TTL, so repeated audits only hit
+  the network for new or expired URLs.
+
+Everything is parameterized (timeouts, retries, cache path), so the checker
+can be pointed at a local stub HTTP server.
+"""
+import asyncio
+import json
+import os
+import time
+
+from httpclient import AsyncHttpClient, HttpError, Metrics, RetryPolicy, host_of
+
+USER_AGENT = 'Mozilla/5.0 (compatible; SEOAuditBot/1.0)'
+
+# Status codes after which HEAD is retried as GET
+HEAD_REJECTED = {400, 403, 404, 405, 501}
+
+
+class ResultCache:
+    """JSON file of url -> {'status', 'ok', 'checked_at'} with a TTL per outcome."""
+
+    def __init__(self, path=None, ttl=86400, error_ttl=3600):
+        self.path = path
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def get(self, url, now=None):
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        ttl = self.ttl if entry['ok'] else self.error_ttl
+        if (now or time.time()) - entry['checked_at'] > ttl:
+            return None
+        return entry['status'], entry['ok']
+
+    def put(self, url, status, ok):
+        self.entries[url] = {'status': status, 'ok': ok, 'checked_at': time.time()}
+
+    def save(self):
+        if not self.path:
+            return
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=0)
+
+
+class LinkChecker:
+    def __init__(self, cache_path=None, ttl=86400, error_ttl=3600, concurrency=50, per_host=4,
+                 timeout=5, retries=2, backoff=0.5, user_agent=USER_AGENT):
+        self.cache = ResultCache(cache_path, ttl=ttl, error_ttl=error_ttl)
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.user_agent = user_agent
+        self.stats = {'cached': 0, 'checked': 0, 'get_fallback': 0, 'retries': 0}
+        # Keyed by host: every external URL is its own path
+        self.metrics = Metrics()
+
+    async def _check_one(self, client, url):
+        try:
+            response = await client.head(url, read_body=False)
+            if response.status in HEAD_REJECTED:
+                self.stats['get_fallback'] += 1
+                response = await client.get(url, read_body=False)
+            status = response.status
+        except HttpError as e:
+            status = e.reason
+        ok = isinstance(status, int) and status < 400
+        return status, ok
+
+    async def check_all(self, urls):
+        """Returns {url: (status, ok)}; status is an int or an error string."""
+        results = {}
+        pending = []
+        for url in sorted(set(urls)):
+            cached = self.cache.get(url)
+            if cached is not None:
+                results[url] = cached
+                self.stats['cached'] += 1
+            else:
+                pending.append(url)
+
+        if pending:
+            client = AsyncHttpClient(headers={'User-Agent': self.user_agent}, timeout=self.timeout,
+                                     retry=RetryPolicy(retries=self.retries, backoff=self.backoff, jitter=0),
+                                     pool_size=self.concurrency, per_host=self.per_host,
+                                     metrics=self.metrics, endpoint_key=host_of)
+            async with client:
+                statuses = await asyncio.gather(*(self._check_one(client, url) for url in pending))
+            for url, (status, ok) in zip(pending, statuses):
+                results[url] = (status, ok)
+                self.cache.put(url, status, ok)
+            self.stats['checked'] += len(pending)
+            self.stats['retries'] = self.metrics.total('retries')
+
+        self.cache.save()
+        return results
+
+    def check(self, urls):
+        return asyncio.run(self.check_all(urls))
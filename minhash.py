@@ -0,0 +1,139 @@
+# Dependencies:
+# pip install numpy
+
+"""
+MinHash + locality-sensitive hashing for near-duplicate detection.
+
+    hasher = MinHasher()
+    sigs = {key: hasher.signature(shingles(normalize_text(text))) for key, text in docs}
+    clusters = lsh_clusters(sigs, threshold=0.8)
+
+Text is NFKC-normalized, case-folded and stripped of whitespace and
+punctuation, then cut into overlapping character shingles, which works for
+CJK text where there are no word boundaries. Signatures are split into LSH
+bands; only documents sharing a band bucket are compared, so the cost grows
+linearly with the number of documents instead of with the number of pairs.
+"""
+import unicodedata
+import zlib
+
+import numpy as np
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+# Buckets larger than this are compared star-wise instead of pairwise
+MAX_BUCKET_PAIRS = 32
+
+
+def normalize_text(text):
+    """NFKC + casefold, keeping only letters and digits (drops spaces and punctuation)."""
+    text = unicodedata.normalize('NFKC', text).casefold()
+    return ''.join(ch for ch in text if ch.isalnum())
+
+
+def shingles(text, k=3):
+    """Set of overlapping k-character shingles of an already normalized string."""
+    if len(text) <= k:
+        return {text} if text else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+class MinHasher:
+    def __init__(self, num_perm=128, seed=1):
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        # a, b < 2^32 and hashes < 2^32 keep a * h + b inside uint64
+        self.a = rng.randint(1, MAX_HASH, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, MAX_HASH, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set):
+        """Returns a uint64 array of length num_perm (all MAX for an empty set)."""
+        if not shingle_set:
+            return np.full(self.num_perm, MERSENNE_PRIME, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingle_set),
+                             dtype=np.uint64, count=len(shingle_set))
+        permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(np.asarray(sig_a) == np.asarray(sig_b)))
+
+
+def choose_bands(num_perm, threshold):
+    """Picks (bands, rows) with bands * rows == num_perm whose S-curve threshold is closest."""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        approx = (1.0 / bands) ** (1.0 / rows)
+        # Prefer slightly lower thresholds: missing a duplicate is worse than one extra check
+        score = abs(approx - threshold) + (0.05 if approx > threshold else 0)
+        if best is None or score < best[0]:
+            best = (score, bands, rows)
+    return best[1], best[2]
+
+
+def lsh_clusters(signatures, threshold=0.8):
+    """
+    Groups keys whose signatures are at least `threshold` similar.
+    Returns [(sorted member keys, min pairwise-edge similarity)], largest first.
+    """
+    keys = list(signatures)
+    if not keys:
+        return []
+    num_perm = len(next(iter(signatures.values())))
+    bands, rows = choose_bands(num_perm, threshold)
+
+    buckets = {}
+    for idx, key in enumerate(keys):
+        sig = np.asarray(signatures[key])
+        for band in range(bands):
+            bucket = (band, sig[band * rows:(band + 1) * rows].tobytes())
+            buckets.setdefault(bucket, []).append(idx)
+
+    # Union-find over verified candidate pairs
+    parent = list(range(len(keys)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    edge_sims = {}
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        # Small buckets: every pair. Oversized buckets (mass duplicates) are
+        # compared to their first entry only, keeping the work linear.
+        if len(members) <= MAX_BUCKET_PAIRS:
+            pairs = ((members[i], members[j]) for i in range(len(members)) for j in range(i + 1, len(members)))
+        else:
+            pairs = ((members[0], other) for other in members[1:])
+        for pair in pairs:
+            if pair in checked:
+                continue
+            checked.add(pair)
+            sim = similarity(signatures[keys[pair[0]]], signatures[keys[pair[1]]])
+            if sim >= threshold:
+                root_a, root_b = find(pair[0]), find(pair[1])
+                if root_a != root_b:
+                    parent[root_b] = root_a
+                edge_sims[pair] = sim
+
+    groups = {}
+    for idx in range(len(keys)):
+        groups.setdefault(find(idx), []).append(idx)
+    min_sim = {}
+    for (a, _), sim in edge_sims.items():
+        root = find(a)
+        min_sim[root] = min(sim, min_sim.get(root, 1.0))
+
+    clusters = [(sorted(keys[m] for m in members), min_sim[root])
+                for root, members in groups.items() if len(members) > 1]
+    clusters.sort(key=lambda c: (-len(c[0]), c[0]))
+    return clusters
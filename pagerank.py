@@ -0,0 +1,106 @@
+# Dependencies:
+# pip install numpy scipy
+
+"""
+Sparse power-iteration PageRank used by audit.py.
+
+    scores, iterations = pagerank(edges, nodes, personalization={'index.html': 1})
+
+`edges` are (source, target) pairs; repeated pairs count as extra weight, the
+same way repeated <a> tags did in the old dict-based loop. Dangling pages
+(no outbound links) hand their rank back through the teleport vector, so the
+scores always sum to 1. Iteration stops once the L1 change drops below `tol`.
+
+Benchmark: python pagerank.py --bench 100000
+"""
+import sys
+import time
+from itertools import chain
+
+import numpy as np
+from scipy import sparse
+
+
+def pagerank_arrays(src, dst, n, damping=0.85, tol=1e-10, max_iter=200, teleport=None):
+    """
+    Core solver over integer node ids (numpy arrays). Returns (scores, iterations),
+    where scores is an ndarray of length n that sums to 1.
+    """
+    # COO -> CSR sums duplicate (source, target) pairs into weights
+    weights = sparse.coo_matrix((np.ones(len(src)), (src, dst)), shape=(n, n)).tocsr()
+
+    out_weight = np.asarray(weights.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_out = np.zeros(n)
+    inv_out[~dangling] = 1.0 / out_weight[~dangling]
+    # transition[target, source] = weight / out_weight(source)
+    transition = (sparse.diags(inv_out) @ weights).T.tocsr()
+
+    if teleport is None:
+        teleport = np.full(n, 1.0 / n)
+
+    x = teleport.copy()
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        x_new = damping * (transition @ x + x[dangling].sum() * teleport) + (1 - damping) * teleport
+        delta = np.abs(x_new - x).sum()
+        x = x_new
+        if delta < tol:
+            break
+    return x, iterations
+
+
+def pagerank(edges, nodes=None, damping=0.85, tol=1e-10, max_iter=200, personalization=None):
+    """Returns ({node: score}, iterations_used). Scores sum to 1."""
+    edges = list(edges)
+    sources = [s for s, _ in edges]
+    targets = [t for _, t in edges]
+    # dict.fromkeys keeps first-seen order and runs at C speed
+    index = {node: i for i, node in enumerate(dict.fromkeys(chain(nodes or (), sources, targets)))}
+    n = len(index)
+    if n == 0:
+        return {}, 0
+
+    src = np.fromiter(map(index.__getitem__, sources), dtype=np.int64, count=len(edges))
+    dst = np.fromiter(map(index.__getitem__, targets), dtype=np.int64, count=len(edges))
+
+    teleport = None
+    if personalization:
+        teleport = np.zeros(n)
+        for node, value in personalization.items():
+            if node in index:
+                teleport[index[node]] = value
+        if teleport.sum() <= 0:
+            raise ValueError("personalization does not match any node in the graph")
+        teleport /= teleport.sum()
+
+    x, iterations = pagerank_arrays(src, dst, n, damping=damping, tol=tol, max_iter=max_iter, teleport=teleport)
+    return dict(zip(index, x.tolist())), iterations
+
+
+def _bench(n_pages, links_per_page=20):
+    rng = np.random.default_rng(0)
+    src = np.repeat(np.arange(n_pages), links_per_page)
+    dst = rng.integers(0, n_pages, size=src.size)
+    # Leave 5% of pages without outbound links to exercise dangling handling
+    keep = ~np.isin(src, rng.choice(n_pages, n_pages // 20, replace=False))
+    src, dst = src[keep], dst[keep]
+
+    t0 = time.perf_counter()
+    x, iterations = pagerank_arrays(src, dst, n_pages)
+    solve_ms = (time.perf_counter() - t0) * 1000
+
+    edges = list(zip((f"p{i}" for i in src.tolist()), (f"p{i}" for i in dst.tolist())))
+    t0 = time.perf_counter()
+    pagerank(edges)
+    labeled_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"{n_pages} pages, {src.size} links: solver {solve_ms:.0f} ms ({iterations} iterations, "
+          f"sum={x.sum():.6f}), with label mapping {labeled_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == '--bench':
+        _bench(int(sys.argv[2]))
+    else:
+        print("Usage: python pagerank.py --bench <pages>")
@@ -0,0 +1,87 @@
+"""
+Append-only JSONL journal for resumable batch runs (the keyword miners).
+
+    journal = RunJournal('mining_journal.jsonl')
+    done = journal.completed_ids()
+    for task in tasks:
+        if task_id(task) not in done:
+            journal.record(task_id(task), run(task))
+    for tid, payload in journal.entries():   # rebuild the final result
+        ...
+    journal.finish()                          # run complete: drop the journal
+
+One line per completed task, flushed as soon as the task finishes, so a crash,
+Ctrl-C or network drop only loses the tasks that were in flight. A torn last
+line (killed mid-write) is ignored on the next read and cut off before the
+next run appends to the journal. Results are streamed back
+from disk, so the caller never has to hold a whole run in memory.
+"""
+import json
+import os
+
+
+class RunJournal:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def entries(self):
+        """Yields (task_id, payload) in completion order."""
+        if not self.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                yield entry['id'], entry['payload']
+
+    def completed_ids(self):
+        return {task_id for task_id, _ in self.entries()}
+
+    def _drop_torn_tail(self):
+        """Cuts a torn last line (no trailing newline) so the next record starts on a line of its own."""
+        with open(self.path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            if not end:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b'\n':
+                return
+            # Scan back block by block to the last complete line
+            pos = end
+            keep = 0
+            while pos > 0:
+                start = max(0, pos - 65536)
+                f.seek(start)
+                newline = f.read(pos - start).rfind(b'\n')
+                if newline >= 0:
+                    keep = start + newline + 1
+                    break
+                pos = start
+            f.truncate(keep)
+
+    def record(self, task_id, payload):
+        if self._file is None:
+            if self.exists():
+                self._drop_torn_tail()
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps({'id': task_id, 'payload': payload}, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def finish(self):
+        """Run completed and its output written: the checkpoint is no longer needed."""
+        self.close()
+        if self.exists():
+            os.remove(self.path)
+
+    reset = finish
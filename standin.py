@@ -0,0 +1,266 @@
+"""
+Record/replay HTTP fixtures and a local stand-in server for the network tools.
+
+    # 1. record once against the live endpoints
+    HTTP_RECORD=$PWD/http_fixtures.jsonl python cli.py collect
+    HTTP_RECORD=$PWD/http_fixtures.jsonl python cli.py mine
+
+    # 2. replay offline, with injected latency and errors
+    python standin.py --port 8800 --latency 80 --jitter 40 --error-rate 0.05 --fallback
+    HTTP_STANDIN=http://127.0.0.1:8800 SUGGEST_CACHE_PATH=:memory: python cli.py mine --fresh
+
+Both variables are read by every httpclient client, so miner.py,
+2_Database_Miner.py, 1_History_Collector.py, OKX_Flash_Monitor.py and
+submit_indexnow.py run unchanged and at full concurrency. In stand-in mode,
+https://host/path?q is requested as http://127.0.0.1:8800/host/path?q.
+
+Fixtures are keyed by method, host, path, sorted query and (for POST) a hash
+of the canonical JSON body, and are stored one JSON line per response, with
+later lines winning. A request with no fixture gets 404, unless --fallback is
+given: then it gets a recorded response from the same endpoint, chosen by a
+stable hash of the request. That keeps the miners running when they expand
+into queries that were never recorded.
+
+Injected faults use a seeded RNG (--seed): latency + jitter, --error-rate
+with --error-status (429 carries Retry-After), and --drop-rate (the
+connection is closed without a response). GET /_stats returns the counters.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURES = os.path.join(BASE_DIR, 'http_fixtures.jsonl')
+# Response headers worth replaying; everything else is connection-specific
+KEPT_HEADERS = ('Content-Type', 'Retry-After')
+
+
+def body_digest(body):
+    """Short hash of a request body; JSON is canonicalized so key order doesn't matter."""
+    if not body:
+        return ''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(',', ':')).encode('utf-8')
+    except ValueError:
+        pass
+    return hashlib.sha1(body).hexdigest()[:16]
+
+
+def fixture_key(method, url, params=None, body=None):
+    """'GET host/path?a=1&b=2' (+ ' #<body digest>'); scheme and parameter order don't matter."""
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    query += [(str(k), str(v)) for k, v in (params or {}).items()]
+    key = f"{method.upper()} {parts.netloc}{parts.path or '/'}"
+    if query:
+        key += '?' + urllib.parse.urlencode(sorted(query))
+    digest = body_digest(body)
+    return f"{key} #{digest}" if digest else key
+
+
+def endpoint_of_key(key):
+    return key.split(' #')[0].split('?')[0]
+
+
+class FixtureStore:
+    """Append-only JSONL of recorded responses, indexed by fixture_key."""
+
+    def __init__(self, path=DEFAULT_FIXTURES):
+        self.path = path
+        self.entries = {}
+        self.by_endpoint = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._index(json.loads(line))
+                    except (ValueError, KeyError):
+                        continue
+
+    def _index(self, entry):
+        key = entry['key']
+        if key not in self.entries:
+            self.by_endpoint.setdefault(endpoint_of_key(key), []).append(key)
+        self.entries[key] = entry
+
+    def record(self, key, status, headers, content):
+        try:
+            body, encoding = content.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode('ascii'), 'base64'
+        entry = {
+            'key': key,
+            'status': status,
+            'headers': {name: headers[name] for name in KEPT_HEADERS if headers.get(name)},
+            'body': body,
+            'encoding': encoding,
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        with self._lock:
+            self._index(entry)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def lookup(self, key, fallback=False):
+        """Returns (entry, exact) or (None, False)."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            return entry, True
+        if fallback:
+            candidates = self.by_endpoint.get(endpoint_of_key(key))
+            if candidates:
+                return self.entries[candidates[zlib.crc32(key.encode('utf-8')) % len(candidates)]], False
+        return None, False
+
+    @staticmethod
+    def content(entry):
+        if entry['encoding'] == 'base64':
+            return base64.b64decode(entry['body'])
+        return entry['body'].encode('utf-8')
+
+
+_RECORDERS = {}
+_RECORDERS_LOCK = threading.Lock()
+
+
+def open_recorder(path):
+    """One store per path per process, shared by every client that records."""
+    path = os.path.abspath(path)
+    with _RECORDERS_LOCK:
+        if path not in _RECORDERS:
+            _RECORDERS[path] = FixtureStore(path)
+        return _RECORDERS[path]
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    store = None
+    fallback = False
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    error_status = 503
+    drop_rate = 0.0
+    rng = None
+    stats = None
+    lock = None
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real endpoints
+
+    def log_message(self, format, *args):
+        pass
+
+    def _count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def _roll(self):
+        with self.lock:
+            return self.rng.random(), self.rng.uniform(-self.jitter, self.jitter)
+
+    def _send(self, status, headers, body=b''):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if self.path == '/_stats':
+            with self.lock:
+                payload = json.dumps(self.stats).encode('utf-8')
+            return self._send(200, {'Content-Type': 'application/json'}, payload)
+
+        self._count('requests')
+        roll, jitter = self._roll()
+        delay = max(0.0, self.latency + jitter)
+        if delay:
+            time.sleep(delay)
+        if roll < self.drop_rate:
+            self._count('dropped')
+            self.close_connection = True
+            return
+        if roll < self.drop_rate + self.error_rate:
+            self._count('errors')
+            headers = {'Retry-After': '1'} if self.error_status == 429 else {}
+            return self._send(self.error_status, headers)
+
+        # /host/path?query -> host/path?query
+        key = fixture_key(self.command, 'http:/' + self.path, body=body)
+        entry, exact = self.store.lookup(key, fallback=self.fallback)
+        if entry is None:
+            self._count('missed')
+            return self._send(404, {'Content-Type': 'text/plain'}, f"No fixture for {key}".encode('utf-8'))
+        self._count('served' if exact else 'fallback')
+        self._send(entry['status'], entry['headers'], self.store.content(entry))
+
+    do_GET = _handle
+    do_HEAD = _handle
+    do_POST = _handle
+
+
+def make_server(store, host='127.0.0.1', port=8800, fallback=False, latency_ms=0, jitter_ms=0,
+                error_rate=0.0, error_status=503, drop_rate=0.0, seed=1):
+    handler = type('Handler', (StandinHandler,), {
+        'store': store,
+        'fallback': fallback,
+        'latency': latency_ms / 1000,
+        'jitter': jitter_ms / 1000,
+        'error_rate': error_rate,
+        'error_status': error_status,
+        'drop_rate': drop_rate,
+        'rng': random.Random(seed),
+        'stats': {'requests': 0, 'served': 0, 'fallback': 0, 'missed': 0, 'errors': 0, 'dropped': 0},
+        'lock': threading.Lock(),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded HTTP fixtures with injected latency and errors")
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help="Fixture file written via HTTP_RECORD")
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--fallback', action='store_true',
+                        help="Answer unrecorded requests with a recorded response from the same endpoint")
+    parser.add_argument('--latency', type=float, default=0, help="Added latency per request (ms)")
+    parser.add_argument('--jitter', type=float, default=0, help="Uniform +/- jitter on the latency (ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--drop-rate', type=float, default=0.0, help="Fraction of connections closed without a response")
+    parser.add_argument('--seed', type=int, default=1, help="Seed for the injected latency/errors")
+    args = parser.parse_args(argv)
+
+    store = FixtureStore(args.fixtures)
+    if not store.entries:
+        print(f"No fixtures in {args.fixtures}; record some with HTTP_RECORD={args.fixtures}")
+        return 1
+    server = make_server(store, port=args.port, fallback=args.fallback, latency_ms=args.latency,
+                         jitter_ms=args.jitter, error_rate=args.error_rate, error_status=args.error_status,
+                         drop_rate=args.drop_rate, seed=args.seed)
+    print(f"Replaying {len(store.entries)} fixtures ({len(store.by_endpoint)} endpoints) "
+          f"at http://127.0.0.1:{server.server_port} (Ctrl-C to stop)")
+    print(f"Point the tools at it with HTTP_STANDIN=http://127.0.0.1:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nStopped. {json.dumps(server.RequestHandlerClass.stats)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,67 +1,335 @@
-import requests
 import xml.etree.ElementTree as ET
 import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+import urllib.parse
+
+from httpclient import AsyncHttpClient, HttpClient, HttpError, RetryPolicy
+
+# 配置信息
+HOST = "join-ouyi.top"
+KEY_FILE = "59e28037c6494a828856707850234123.txt"
+DEFAULT_ENDPOINT = "https://api.indexnow.org/indexnow"
+# 提交台账: 每个 URL 上次成功提交时的 lastmod 和内容哈希
+LEDGER_FILE = ".indexnow_ledger.json"
+# IndexNow 协议: 单次请求最多 10,000 个 URL
+MAX_BATCH = 10000
+MAX_RETRIES = 5
+SITEMAP_NS = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+JSON_HEADERS = {"User-Agent": "Mozilla/5.0", "Content-Type": "application/json; charset=utf-8"}
+
+# build.py --notify 并发推送的 IndexNow 兼容接口: (地址, 每秒最多请求数, 单次超时秒数)
+NOTIFY_ENDPOINTS = [
+    ("https://api.indexnow.org/indexnow", 1.0, 10),
+    ("https://www.bing.com/indexnow", 1.0, 10),
+    ("https://yandex.com/indexnow", 1.0, 10),
+    ("https://search.seznam.cz/indexnow", 1.0, 10),
+    ("https://searchadvisor.naver.com/indexnow", 1.0, 10),
+]
+# 推送结果日志，每行一条 JSON
+NOTIFY_LOG = ".indexnow_log.jsonl"
+# 后台推送进程的 stderr (缺少密钥文件、4xx、异常栈)，单独存放以免混进 JSON 日志
+NOTIFY_ERR = ".indexnow_notify.err"
+
+
+def read_sitemap(path='sitemap.xml'):
+    """返回 [(loc, lastmod)]"""
+    tree = ET.parse(path)
+    entries = []
+    for url in tree.getroot().findall('ns:url', SITEMAP_NS):
+        loc = url.find('ns:loc', SITEMAP_NS)
+        lastmod = url.find('ns:lastmod', SITEMAP_NS)
+        if loc is not None and loc.text:
+            entries.append((loc.text.strip(), lastmod.text.strip() if lastmod is not None and lastmod.text else None))
+    return entries
+
+
+def local_file_for(url, root_dir='.'):
+    """Clean URL -> 本地 HTML 文件 (/ -> index.html, /blog/fee -> blog/fee.html)"""
+    path = urllib.parse.unquote(urllib.parse.urlsplit(url).path).lstrip('/')
+    candidates = [os.path.join(path, 'index.html')] if not path or path.endswith('/') else \
+        [path, f"{path}.html", os.path.join(path, 'index.html')]
+    for candidate in candidates:
+        full = os.path.join(root_dir, candidate)
+        if os.path.isfile(full):
+            return full
+    return None
+
+
+def content_hash(file_path):
+    if not file_path:
+        return None
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def url_states(urls, sitemap_path='sitemap.xml'):
+    """{url: (lastmod, 内容哈希)}，与 submit_to_indexnow 比对台账的状态一致 (lastmod 取自 sitemap)"""
+    lastmods = {}
+    if os.path.exists(sitemap_path):
+        try:
+            lastmods = dict(read_sitemap(sitemap_path))
+        except ET.ParseError:
+            pass
+    return {url: (lastmods.get(url), content_hash(local_file_for(url))) for url in urls}
+
+
+class SubmissionLedger:
+    def __init__(self, path=LEDGER_FILE):
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def is_current(self, url, lastmod, digest):
+        entry = self.entries.get(url)
+        return entry is not None and entry.get('lastmod') == lastmod and entry.get('hash') == digest
+
+    def record(self, urls, states):
+        now = time.strftime('%Y-%m-%dT%H:%M:%S')
+        for url in urls:
+            lastmod, digest = states[url]
+            self.entries[url] = {'lastmod': lastmod, 'hash': digest, 'submitted_at': now}
+
+    def save(self):
+        if not self.path:
+            return
+        # 先写临时文件再替换，中途被打断也不会损坏台账
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def post_with_retry(client, endpoint, payload, max_retries=MAX_RETRIES, backoff=1.0):
+    """
+    429 / 5xx / 网络错误时指数退避重试 (httpclient.RetryPolicy，优先使用 Retry-After)。
+    返回 (是否成功, 状态码或错误信息)。
+    """
+    def on_retry(attempt, status, wait):
+        print(f"   ⏳ {status}，{wait:.0f}s 后重试 ({attempt}/{max_retries})")
+
+    retry = RetryPolicy(retries=max_retries, backoff=backoff, jitter=0, on_retry=on_retry)
+    try:
+        response = client.post(endpoint, json=payload, timeout=30, retry=retry)
+    except HttpError as e:
+        return False, e.reason
+    if response.status in (200, 202):
+        return True, response.status
+    # 400/403/422 等重试也不会成功; 429/5xx 则是重试次数已用完
+    return False, f"{response.status} {response.text[:200]}"
+
+
+def read_api_key():
+    with open(KEY_FILE, 'r') as f:
+        return f.read().strip()
+
+
+async def _notify_endpoint(client, endpoint, rate, timeout, batches, api_key, backoff=1.0):
+    """按速率限制把各批 URL 依次发给一个接口，返回日志记录列表"""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    interval = 1.0 / rate if rate else 0
+    next_slot = 0.0
+    records = []
+    for n, batch in enumerate(batches):
+        payload = {"host": HOST, "key": api_key, "keyLocation": f"https://{HOST}/{KEY_FILE}", "urlList": batch}
+        # 同一接口的请求间隔不小于 1/rate 秒 (重试之间由退避保证间隔)
+        wait = next_slot - loop.time()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        started = loop.time()
+        retries = []
+        retry = RetryPolicy(retries=MAX_RETRIES, backoff=max(backoff, interval), jitter=0,
+                            on_retry=lambda attempt, status, wait: retries.append(attempt))
+        try:
+            response = await client.post(endpoint, json=payload, timeout=timeout, retry=retry)
+            status = response.status
+        except HttpError as e:
+            status = e.reason
+        next_slot = loop.time() + interval
+        ok = status in (200, 202)
+        records.append({
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'endpoint': endpoint,
+            'batch': n,
+            'urls': len(batch),
+            'status': status,
+            'ok': ok,
+            'attempts': len(retries) + 1,
+            'elapsed_ms': round((loop.time() - started) * 1000),
+        })
+        if not ok:
+            # 接口不可用，剩余批次不再浪费重试
+            break
+    return records
+
+
+async def notify_async(urls, endpoints=None, batch_size=MAX_BATCH, backoff=1.0, log_path=NOTIFY_LOG,
+                       ledger_path=LEDGER_FILE):
+    """
+    把同一批 URL 并发推送到所有接口。每个接口有自己的速率限制和超时，
+    慢接口不会拖住其它接口。结果追加写入 log_path 并返回。
+    被任一接口接受的批次记入提交台账 (IndexNow 接口之间共享提交)，
+    之后的 submit 不会重复提交这些 URL。
+    """
+    import asyncio
+
+    api_key = read_api_key()
+    endpoints = endpoints or NOTIFY_ENDPOINTS
+    batches = [urls[i:i + batch_size] for i in range(0, len(urls), batch_size)]
+    async with AsyncHttpClient(headers=JSON_HEADERS, timeout=max(timeout for _, _, timeout in endpoints),
+                               pool_size=len(endpoints), per_host=1) as client:
+        results = await asyncio.gather(*[
+            _notify_endpoint(client, endpoint, rate, timeout, batches, api_key, backoff)
+            for endpoint, rate, timeout in endpoints
+        ])
+    records = [record for endpoint_records in results for record in endpoint_records]
+    accepted = sorted({record['batch'] for record in records if record['ok']})
+    if ledger_path and accepted:
+        ledger = SubmissionLedger(ledger_path)
+        states = url_states(urls)
+        for n in accepted:
+            ledger.record(batches[n], states)
+        ledger.save()
+    if log_path:
+        with open(log_path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return records
+
+
+def notify_in_background(urls, endpoints=None, root_dir=None):
+    """
+    build.py 调用: 在独立的后台进程中推送，构建立即返回，不等待任何接口。
+    结果写入 root_dir (默认站点根目录) 下的 NOTIFY_LOG，
+    失败信息 (缺少密钥文件、4xx、异常栈) 通过 stderr 追加到 NOTIFY_ERR。
+    """
+    if not urls:
+        return None
+    cmd = [sys.executable, os.path.abspath(__file__), '--notify', '-']
+    if endpoints:
+        cmd += ['--endpoints', ','.join(endpoints)]
+    root_dir = root_dir or os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(root_dir, NOTIFY_ERR), 'ab') as err:
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=err,
+                                   cwd=root_dir, start_new_session=True)
+    process.stdin.write('\n'.join(urls).encode('utf-8'))
+    process.stdin.close()
+    return process
+
+
+def notify_main(args):
+    import asyncio
+
+    urls = args.urls
+    if urls == ['-']:
+        urls = [line.strip() for line in sys.stdin if line.strip()]
+    if not urls:
+        print("没有需要推送的 URL")
+        return 0
+    endpoints = None
+    if args.endpoints:
+        # 自定义接口沿用默认的速率和超时
+        endpoints = [(url.strip(), 1.0, 10) for url in args.endpoints.split(',') if url.strip()]
+    try:
+        records = asyncio.run(notify_async(urls, endpoints, batch_size=max(1, min(args.batch_size, MAX_BATCH)),
+                                           backoff=args.backoff, ledger_path=args.ledger))
+    except FileNotFoundError:
+        print(f"错误: 找不到密钥文件 {KEY_FILE}", file=sys.stderr)
+        return 1
+    for record in records:
+        # 失败的写 stderr: 后台推送时 stderr 追加到 NOTIFY_ERR
+        out = sys.stdout if record['ok'] else sys.stderr
+        mark = '✅' if record['ok'] else '❌'
+        print(f"{mark} {record['endpoint']}: {record['urls']} 个 URL, 状态 {record['status']}, {record['elapsed_ms']} ms", file=out)
+    return 0 if any(record['ok'] for record in records) else 1
+
+
+def submit_to_indexnow(argv=None):
+    parser = argparse.ArgumentParser(description="把 sitemap.xml 中新增/变更的 URL 推送到 IndexNow")
+    parser.add_argument('--endpoint', default=os.environ.get('INDEXNOW_ENDPOINT', DEFAULT_ENDPOINT),
+                        help="IndexNow 接口地址 (测试时可指向本地桩服务)")
+    parser.add_argument('--batch-size', type=int, default=MAX_BATCH, help="每批 URL 数 (上限 10000)")
+    parser.add_argument('--ledger', default=LEDGER_FILE, help="提交台账文件")
+    parser.add_argument('--force', action='store_true', help="忽略台账，全部重新提交")
+    parser.add_argument('--dry-run', action='store_true', help="只列出待提交的 URL，不发送")
+    parser.add_argument('--backoff', type=float, default=1.0, help="重试的初始退避秒数")
+    parser.add_argument('--notify', action='store_true',
+                        help="把给定的 URL (或 '-' 表示从 stdin 读取) 并发推送到所有 IndexNow 接口，不读 sitemap")
+    parser.add_argument('--endpoints', help="--notify 使用的接口列表，逗号分隔 (默认 NOTIFY_ENDPOINTS)")
+    parser.add_argument('urls', nargs='*', help="--notify 模式下要推送的 URL")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    batch_size = max(1, min(args.batch_size, MAX_BATCH))
+    if args.notify:
+        return notify_main(args)
+
+    key_location = f"https://{HOST}/{KEY_FILE}"
 
-def submit_to_indexnow():
-    # 配置信息
-    host = "join-ouyi.top"
-    key_file = "59e28037c6494a828856707850234123.txt"
-    key_location = f"https://{host}/{key_file}"
-    
     # 1. 读取 API Key
     try:
-        with open(key_file, 'r') as f:
-            api_key = f.read().strip()
+        api_key = read_api_key()
     except FileNotFoundError:
-        print(f"错误: 找不到密钥文件 {key_file}")
-        return
+        print(f"错误: 找不到密钥文件 {KEY_FILE}")
+        return 1
 
     # 2. 从 sitemap.xml 读取所有 URL
-    urls = []
     try:
-        tree = ET.parse('sitemap.xml')
-        root = tree.getroot()
-        # 处理带有命名空间的 XML
-        namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        for url in root.findall('ns:url', namespace):
-            loc = url.find('ns:loc', namespace).text
-            if loc:
-                urls.append(loc)
+        entries = read_sitemap('sitemap.xml')
     except Exception as e:
         print(f"读取 sitemap.xml 出错: {e}")
-        return
+        return 1
+
+    # 3. 与台账比对，只提交新增或变更 (lastmod / 内容哈希不同) 的 URL
+    ledger = SubmissionLedger(args.ledger)
+    states = {loc: (lastmod, content_hash(local_file_for(loc))) for loc, lastmod in entries}
+    urls = [url for url, (lastmod, digest) in states.items()
+            if args.force or not ledger.is_current(url, lastmod, digest)]
 
     if not urls:
-        print("没有找到需要提交的 URL")
-        return
+        print(f"没有需要提交的 URL ({len(states)} 个均未变化)")
+        return 0
 
-    print(f"准备提交 {len(urls)} 个 URL...")
+    print(f"准备提交 {len(urls)} 个 URL (共 {len(states)} 个, {len(states) - len(urls)} 个未变化)...")
     for url in urls:
         print(f" - {url}")
+    if args.dry_run:
+        return 0
 
-    # 3. 构造 IndexNow 请求
-    payload = {
-        "host": host,
-        "key": api_key,
-        "keyLocation": key_location,
-        "urlList": urls
-    }
+    # 4. 分批发送 (httpclient 延迟导入 requests，保持 CLI 启动速度)
+    batches = [urls[i:i + batch_size] for i in range(0, len(urls), batch_size)]
+    submitted = 0
+    with HttpClient(headers=JSON_HEADERS) as client:
+        for n, batch in enumerate(batches, 1):
+            payload = {
+                "host": HOST,
+                "key": api_key,
+                "keyLocation": key_location,
+                "urlList": batch
+            }
+            ok, status = post_with_retry(client, args.endpoint, payload, backoff=args.backoff)
+            if not ok:
+                # 已成功的批次已写入台账，下次运行从这里继续
+                print(f"\n❌ 第 {n}/{len(batches)} 批提交失败: {status}")
+                print(f"已提交 {submitted} 个，剩余 {len(urls) - submitted} 个将在下次运行时重试。")
+                return 1
+            ledger.record(batch, states)
+            ledger.save()
+            submitted += len(batch)
+            print(f"✅ 第 {n}/{len(batches)} 批: {len(batch)} 个 URL 已接受 (状态码 {status})")
+        print(client.metrics.brief())
 
-    # 4. 发送请求
-    endpoint = "https://api.indexnow.org/indexnow"
-    try:
-        response = requests.post(endpoint, json=payload, headers={"Content-Type": "application/json; charset=utf-8"})
-        
-        if response.status_code == 200:
-            print("\n✅ 提交成功！必应已收到 URL 推送。")
-        elif response.status_code == 202:
-            print("\n✅ 提交成功！请求已被接受。")
-        else:
-            print(f"\n❌ 提交失败。状态码: {response.status_code}")
-            print(f"响应内容: {response.text}")
-            
-    except Exception as e:
-        print(f"\n❌ 请求发送出错: {e}")
+    print(f"\n✅ 提交成功！共 {submitted} 个 URL。")
+    return 0
 
 if __name__ == "__main__":
-    submit_to_indexnow()
+    sys.exit(submit_to_indexnow())
@@ -0,0 +1,119 @@
+"""
+Persistent cache of search-suggestion responses, shared by the keyword miners
+(MasterTool/miner.py, OKX_Vertical_SEO/2_Database_Miner.py).
+
+    cache = SuggestionCache(ttl=24 * 3600)
+    suggestions = cache.get('Google', query, 'zh-CN')
+    if suggestions is None:
+        suggestions = fetch(...)
+        cache.put('Google', query, 'zh-CN', suggestions)
+    print(cache.stats)
+
+Entries are keyed by (source, normalized query, locale), so "OKX  注册" and
+"okx 注册" share one entry. Expired entries count as misses; once the table
+grows past `max_entries` the oldest fetches are evicted. Only successful
+responses should be stored (an empty suggestion list is a valid answer, a
+network error is not). SUGGEST_CACHE_PATH overrides the database location;
+`:memory:` gives a throwaway cache, e.g. for benchmarks against standin.py.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+DEFAULT_PATH = os.environ.get('SUGGEST_CACHE_PATH') or \
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.suggest_cache.sqlite')
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 200000
+# Evict at most this often (in puts), not on every write
+EVICT_EVERY = 500
+
+
+def normalize_query(query):
+    """NFKC + casefold + collapsed whitespace."""
+    return ' '.join(unicodedata.normalize('NFKC', query).casefold().split())
+
+
+class SuggestionCache:
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'stored': 0, 'evicted': 0}
+        self._puts = 0
+        # Miners call in from thread pools; one connection behind a lock is plenty
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS suggestions (
+                source TEXT NOT NULL,
+                query TEXT NOT NULL,
+                locale TEXT NOT NULL,
+                results TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (source, query, locale)
+            )""")
+        self._db.execute('CREATE INDEX IF NOT EXISTS idx_suggestions_fetched ON suggestions (fetched_at)')
+
+    def get(self, source, query, locale=''):
+        """Cached suggestion list, or None on a miss / expired entry."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT results, fetched_at FROM suggestions WHERE source = ? AND query = ? AND locale = ?',
+                (source, normalize_query(query), locale)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            if self.ttl is not None and time.time() - row[1] > self.ttl:
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            return json.loads(row[0])
+
+    def put(self, source, query, locale, results):
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO suggestions (source, query, locale, results, fetched_at) VALUES (?, ?, ?, ?, ?)',
+                (source, normalize_query(query), locale, json.dumps(list(results), ensure_ascii=False), time.time()))
+            self.stats['stored'] += 1
+            self._puts += 1
+            if self._puts % EVICT_EVERY == 0:
+                self._evict()
+
+    def _evict(self):
+        if not self.max_entries:
+            return
+        count = self._db.execute('SELECT COUNT(*) FROM suggestions').fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                'DELETE FROM suggestions WHERE rowid IN (SELECT rowid FROM suggestions ORDER BY fetched_at LIMIT ?)',
+                (excess,))
+            self.stats['evicted'] += excess
+
+    def purge_expired(self):
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute('DELETE FROM suggestions WHERE fetched_at < ?', (time.time() - self.ttl,))
+            return cursor.rowcount
+
+    def hit_rate(self):
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,67 @@
+"""
+Search-suggestion source adapters shared by the keyword miners
+(MasterTool/miner.py, OKX_Vertical_SEO/2_Database_Miner.py).
+
+    for source in SOURCES:
+        response = client.get(source.url, params=source.params(query, 'zh-CN'), timeout=source.timeout)
+        suggestions = source.parse(response.json())
+
+Each source declares its endpoint, how the query and locale are passed, how
+the response is parsed, and its own politeness limits (requests per second,
+burst, concurrent requests, timeout). The miners give every source its own
+connection pool, rate limiter and workers, so a slow or throttled source
+never holds up the others. Adding a source means appending one entry to
+SOURCES; nothing in the miners branches on source names.
+"""
+
+
+def parse_opensearch(data):
+    """OpenSearch suggestions JSON: [query, [suggestion, ...], ...]."""
+    if isinstance(data, list) and len(data) > 1 and isinstance(data[1], list):
+        return [s for s in data[1] if isinstance(s, str)]
+    return []
+
+
+def parse_bing(data):
+    """osjson.aspx is OpenSearch; the older qsonhs.aspx shape is still accepted."""
+    if isinstance(data, list):
+        return parse_opensearch(data)
+    if isinstance(data, dict) and 'AS' in data:
+        results = data['AS'].get('Results') or []
+        return [item['Txt'] for group in results for item in group.get('Suggests', [])]
+    return []
+
+
+class SuggestSource:
+    def __init__(self, name, url, query_param, parse, locale_param=None, extra_params=None,
+                 rate=4.0, burst=4, concurrency=4, timeout=5, trusted=False):
+        self.name = name
+        self.url = url
+        self.query_param = query_param
+        self.parse = parse
+        self.locale_param = locale_param
+        self.extra_params = extra_params or {}
+        self.rate = rate                # requests per second
+        self.burst = burst              # token bucket capacity
+        self.concurrency = concurrency  # requests in flight (and pooled connections)
+        self.timeout = timeout
+        # Suggestions good enough to keep without a second source agreeing
+        self.trusted = trusted
+
+    def params(self, query, locale):
+        params = dict(self.extra_params)
+        params[self.query_param] = query
+        if self.locale_param:
+            params[self.locale_param] = locale
+        return params
+
+    def __repr__(self):
+        return f"SuggestSource({self.name!r})"
+
+
+SOURCES = [
+    SuggestSource('Google', 'http://suggestqueries.google.com/complete/search', 'q', parse_opensearch,
+                  locale_param='hl', extra_params={'client': 'chrome', 'ds': ''}, trusted=True),
+    SuggestSource('Bing', 'https://api.bing.com/osjson.aspx', 'query', parse_bing, locale_param='mkt'),
+]
+
@@ -0,0 +1,98 @@
+"""
+Shared fixtures: a local HTTP stub server with scripted responses.
+
+    def test_retry(stub):
+        stub.route('/flaky', Reply(503), Reply(200, b'ok'))
+        ...get(stub.url('/flaky'))...
+        assert stub.methods('/flaky') == ['GET', 'GET']
+
+Each route replays its replies in order and then keeps repeating the last
+one; unknown paths get 404. Every request is logged as (method, path, body).
+"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# The shared modules live in the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class Reply:
+    def __init__(self, status=200, body=b'', headers=None, delay=0):
+        self.status = status
+        self.body = body.encode('utf-8') if isinstance(body, str) else body
+        self.headers = headers or {}
+        self.delay = delay
+
+
+class StubServer:
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                path = self.path.split('?', 1)[0]
+                reply = stub._next(self.command, self.path, path, body)
+                if reply.delay:
+                    time.sleep(reply.delay)
+                try:
+                    self.send_response(reply.status)
+                    for name, value in reply.headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', str(len(reply.body)))
+                    self.end_headers()
+                    if self.command != 'HEAD':
+                        self.wfile.write(reply.body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client gave up (timeout tests)
+
+            do_GET = do_HEAD = do_POST = _serve
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def route(self, path, *replies):
+        with self._lock:
+            self.routes[path] = list(replies) or [Reply()]
+
+    def url(self, path):
+        return self.base + path
+
+    def methods(self, path):
+        with self._lock:
+            return [method for method, full, body in self.requests if full.split('?', 1)[0] == path]
+
+    def _next(self, method, full_path, path, body):
+        with self._lock:
+            self.requests.append((method, full_path, body))
+            replies = self.routes.get(path)
+            if not replies:
+                return Reply(404)
+            return replies.pop(0) if len(replies) > 1 else replies[0]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    # Tests talk to the stub directly, never through a recorder or stand-in
+    monkeypatch.delenv('HTTP_STANDIN', raising=False)
+    monkeypatch.delenv('HTTP_RECORD', raising=False)
+    server = StubServer()
+    server.thread.start()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
@@ -0,0 +1,22 @@
+import os
+import sys
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'MasterTool'))
+import analyzer  # noqa: E402
+
+
+def test_heat_consensus_is_any_two_sources():
+    single = analyzer.calculate_heat('usdt怎么买', {'Google'}, 1)
+    assert analyzer.calculate_heat('usdt怎么买', {'Google', 'Bing'}, 1) == single + 2
+    assert analyzer.calculate_heat('usdt怎么买', {'Bing', 'DuckDuckGo'}, 1) == single + 2
+
+
+def test_aggregate_then_analyze_counts_every_row():
+    rows = [('usdt怎么买', 'Google'), ('USDT 怎么买', 'Bing'), ('usdt怎么买', 'Google'), ('btc价格', 'Bing')]
+    analysis = analyzer.analyze_raw_data(analyzer.aggregate_rows(rows))
+    assert analysis['total_raw'] == 4
+    assert analysis['sources_stats'] == {'Google': 2, 'Bing': 2}
+    top = analysis['all_keywords'][0]
+    assert top['Keyword'] == 'usdt怎么买' and top['Count'] == 3 and top['SourceDisplay'] == 'Bing + Google'
@@ -0,0 +1,125 @@
+import json
+import os
+
+import audit
+from audit import AuditCache, Auditor
+
+PAGE = """<!DOCTYPE html><html><head><title>Fee guide</title>
+<meta name="description" content="How trading fees work."></head>
+<body><h1>Fees</h1><p>Maker and taker fees explained.</p><a href="/">Home</a></body></html>"""
+
+
+def make_site(tmp_path):
+    (tmp_path / 'index.html').write_text(PAGE.replace('Fee guide', 'Home'), encoding='utf-8')
+    (tmp_path / 'fee.html').write_text(PAGE, encoding='utf-8')
+    return tmp_path
+
+
+def parses(monkeypatch):
+    """Records (rel_path, full_parse) for every page that is actually parsed."""
+    calls = []
+    extract = audit._extract_worker
+
+    def spy(file_path, rel_path, full_parse=False):
+        calls.append((rel_path, full_parse))
+        return extract(file_path, rel_path, full_parse)
+
+    monkeypatch.setattr(audit, '_extract_worker', spy)
+    return calls
+
+
+def test_cache_is_keyed_by_parser_mode(tmp_path, monkeypatch):
+    site = make_site(tmp_path)
+    calls = parses(monkeypatch)
+
+    Auditor(str(site)).scan_files(full_parse=False)
+    assert sorted(calls) == [('fee.html', False), ('index.html', False)]
+
+    # Unchanged pages: the streaming facts are reused...
+    calls.clear()
+    Auditor(str(site)).scan_files(full_parse=False)
+    assert calls == []
+
+    # ...but never stand in for --full-parse
+    Auditor(str(site)).scan_files(full_parse=True)
+    assert sorted(calls) == [('fee.html', True), ('index.html', True)]
+
+    keys = json.loads((site / Auditor.CACHE_FILE).read_text())['entries']
+    assert keys and all(k.startswith('full:') for k in keys)
+
+
+def test_cache_key_format():
+    assert AuditCache.key('abc') == 'stream:abc'
+    assert AuditCache.key('abc', full_parse=True) == 'full:abc'
+
+
+def test_generated_dashboards_are_not_audited(tmp_path):
+    make_site(tmp_path)
+    for tool_dir in ('MasterTool', 'OKX_Vertical_SEO'):
+        (tmp_path / tool_dir).mkdir()
+        (tmp_path / tool_dir / 'Dashboard.html').write_text(PAGE, encoding='utf-8')
+    rel_paths = [rel_path for _, rel_path in Auditor(str(tmp_path), use_cache=False).collect_files()]
+    assert rel_paths == ['fee.html', 'index.html']
+
+
+def test_media_served_from_public_is_charged_once(tmp_path):
+    (tmp_path / 'public').mkdir()
+    (tmp_path / 'public' / 'demo.mp4').write_bytes(b'\0' * 5000)
+    (tmp_path / 'index.html').write_text(
+        PAGE.replace('<p>', '<video><source src="/demo.mp4"><source src="public/demo.mp4"></video>'
+                            '<img src="/missing.png"><p>'), encoding='utf-8')
+    auditor = Auditor(str(tmp_path), use_cache=False)
+    auditor.config.perf_budget['media_bytes'] = 4000
+    auditor.scan_files()
+
+    perf = auditor.perf['index.html']
+    assert perf['media_bytes'] == 5000  # both <source> tags are the same file
+    assert perf['over_budget'] == ['media_bytes'] and auditor.budget_failures == 1
+    messages = [issue['message'] for issue in auditor.issues]
+    assert any("'/missing.png' does not resolve" in m for m in messages)
+    assert not any('demo.mp4' in m and 'does not resolve' in m for m in messages)
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr('sys.argv', ['audit.py', '--no-cache', '--workers', '1', *args])
+    return audit.main()
+
+
+def test_changed_since_against_baseline(tmp_path, monkeypatch):
+    make_site(tmp_path)
+    (tmp_path / 'card.html').write_text(PAGE.replace('<p>', '<h1>Card</h1><p>'), encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    assert run_main(monkeypatch, '--report', 'baseline.json') == 0
+    baseline = json.loads((tmp_path / 'baseline.json').read_text(encoding='utf-8'))
+    assert "card.html: Found 2 H1 tags (expected 1)" in [i['message'] for i in baseline['issues']]
+
+    # Nothing changed since: every per-page issue is carried over, none new
+    for page in ('index.html', 'fee.html', 'card.html'):
+        os.utime(tmp_path / page, (1000, 1000))
+    assert run_main(monkeypatch, '--baseline', 'baseline.json', '--changed-since', '@2000') == 0
+
+    # fee.html gains a dead link and loses its missing-schema warning
+    (tmp_path / 'fee.html').write_text(
+        PAGE.replace('</head>', '<script type="application/ld+json">{}</script></head>')
+            .replace('<a href="/">', '<a href="/nope">Nope</a><a href="/">'), encoding='utf-8')
+    os.utime(tmp_path / 'fee.html', (3000, 3000))
+    new, fixed = [], []
+    run = Auditor.run
+
+    def spy(self, **kwargs):
+        diff = run(self, **kwargs)
+        new.extend(diff[0])
+        fixed.extend(diff[1])
+        return diff
+
+    monkeypatch.setattr(Auditor, 'run', spy)
+    assert run_main(monkeypatch, '--baseline', 'baseline.json', '--changed-since', '@2000',
+                    '--report', 'report.json') == 1
+
+    assert [(i['type'], i['page']) for i in new] == [('ERROR', 'fee.html')]
+    assert "Dead link to '/nope'" in new[0]['message']
+    assert [i['message'] for i in fixed] == ["fee.html: Missing Schema (JSON-LD)"]
+    report = json.loads((tmp_path / 'report.json').read_text(encoding='utf-8'))
+    assert report['scope'] == ['fee.html']
+    # card.html was not re-checked, but its error is carried over from the baseline
+    assert "card.html: Found 2 H1 tags (expected 1)" in [i['message'] for i in report['issues']]
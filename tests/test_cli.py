@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+import pytest
+
+import cli
+from conftest import ROOT
+
+HEAVY = ('requests', 'aiohttp', 'bs4', 'scipy')
+
+# Runs the CLI in a fresh interpreter, then lists which heavy modules got imported
+PROBE = """
+import sys
+sys.path.insert(0, {root!r})
+import cli
+try:
+    code = cli.main({argv!r})
+except SystemExit as e:
+    code = e.code
+print('HEAVY=' + ','.join(m for m in {heavy!r} if m in sys.modules))
+sys.exit(code)
+"""
+
+
+def probe(*argv):
+    script = PROBE.format(root=ROOT, argv=list(argv), heavy=HEAVY)
+    return subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, timeout=60)
+
+
+def test_help_loads_no_heavy_modules():
+    result = probe('--timings', '--help')
+    assert 'HEAVY=\n' in result.stdout
+    assert '[timings]' in result.stderr
+
+
+# Commands whose own --help only parses arguments (build/monitor/collect ignore it and run)
+@pytest.mark.parametrize('command', ['clean', 'store', 'submit', 'standin', 'mine'])
+def test_dispatch_loads_no_heavy_modules(command):
+    result = probe('--timings', command, '--help')
+    assert 'usage:' in result.stdout
+    assert 'HEAVY=\n' in result.stdout, result.stdout
+
+
+def test_timings_over_budget_fails(monkeypatch, capsys):
+    monkeypatch.setattr(cli, 'STARTUP_BUDGET_MS', -1)
+    assert cli.main(['--timings', '--help']) == cli.EXIT_OVER_BUDGET
+    assert 'OVER BUDGET' in capsys.readouterr().err
+
+
+def test_timings_within_budget_keeps_command_exit_code(monkeypatch):
+    monkeypatch.setattr(cli, 'STARTUP_BUDGET_MS', 10 ** 6)
+    monkeypatch.setattr(sys, 'argv', sys.argv[:])
+    monkeypatch.chdir(ROOT)  # restored after cli.main changes directory
+    # argparse --help exits 0 through SystemExit
+    assert cli.main(['--timings', 'standin', '--help']) == 0
@@ -0,0 +1,55 @@
+import asyncio
+
+from conftest import Reply
+from crawler import Crawler
+
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+
+
+def extract_links(text):
+    """Minimal stand-in for audit's fact extractor: every href on the page."""
+    import re
+    return {'links': [(href, '') for href in re.findall(r'href="([^"]+)"', text)]}
+
+
+def crawl(crawler):
+    return asyncio.run(asyncio.wait_for(crawler.crawl(), timeout=10))
+
+
+def test_crawls_internal_links(stub):
+    stub.route('/', Reply(200, '<a href="/a">a</a><a href="https://example.com/x">x</a>', HTML))
+    stub.route('/a', Reply(200, '<a href="/">home</a>', HTML))
+    results = crawl(Crawler(stub.base, extract_links, concurrency=2))
+    assert set(results) == {'/', '/a'}
+    assert results['/a']['status'] == 200 and results['/a']['error'] is None
+
+
+def test_unexpected_error_is_recorded_and_workers_survive(stub):
+    # Facts without 'links' blow up inside _fetch_page with a KeyError on every page
+    stub.route('/', Reply(200, '<p>home</p>', HTML))
+    stub.route('/sitemap.xml', Reply(200, '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                                          '<url><loc>https://example.com/a</loc></url>'
+                                          '<url><loc>https://example.com/b</loc></url></urlset>'))
+    stub.route('/a', Reply(200, '<p>a</p>', HTML))
+    stub.route('/b', Reply(200, '<p>b</p>', HTML))
+    results = crawl(Crawler(stub.base, lambda text: {}, concurrency=1))
+    assert set(results) == {'/', '/a', '/b'}
+    for result in results.values():
+        assert result['error'].startswith('crawl failed: KeyError')
+
+
+def test_redirect_target_is_a_graph_node(stub, tmp_path):
+    from audit import Auditor
+
+    page = '<html><head><title>{0}</title></head><body><h1>{0}</h1>{1}</body></html>'
+    stub.route('/', Reply(200, page.format('Home', '<a href="/old">old</a>'), HTML))
+    stub.route('/old', Reply(301, headers={'Location': '/new'}))
+    stub.route('/new', Reply(200, page.format('New', '<a href="/">home</a>'), HTML))
+
+    auditor = Auditor(str(tmp_path), use_cache=False)
+    auditor.crawl_site(stub.base, concurrency=2)
+    assert set(auditor.pages) == {'/', '/new'}
+    assert auditor.graph['/new'] == ['/'] and auditor.graph['/'] == ['/new']
+    auditor.analyze_graph()
+    assert set(auditor.pagerank) == {'/', '/new'}
+    assert not any('Orphan' in issue['message'] for issue in auditor.issues)
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+import pytest
+
+from conftest import Reply
+from httpclient import NO_RETRY, AsyncHttpClient, HttpClient, HttpError, RetryPolicy
+
+
+def fetch_async(url, **kwargs):
+    client_options = kwargs.pop('client', {})
+
+    async def run():
+        async with AsyncHttpClient(**client_options) as client:
+            return await client.get(url, **kwargs)
+
+    return asyncio.run(run())
+
+
+def test_async_client_timeout_applies_without_per_request_timeout(stub):
+    stub.route('/slow', Reply(200, b'late', delay=3))
+    started = time.perf_counter()
+    with pytest.raises(HttpError):
+        fetch_async(stub.url('/slow'), client={'timeout': 0.5, 'retry': NO_RETRY})
+    assert time.perf_counter() - started < 2
+
+
+def test_async_per_request_timeout_overrides_client(stub):
+    stub.route('/slow', Reply(200, b'late', delay=1))
+    response = fetch_async(stub.url('/slow'), timeout=3, client={'timeout': 0.2, 'retry': NO_RETRY})
+    assert response.status == 200 and response.content == b'late'
+
+
+def test_sync_client_timeout(stub):
+    stub.route('/slow', Reply(200, b'late', delay=3))
+    started = time.perf_counter()
+    with HttpClient(timeout=0.5, retry=NO_RETRY) as client, pytest.raises(HttpError):
+        client.get(stub.url('/slow'))
+    assert time.perf_counter() - started < 2
+
+
+def test_async_retries_5xx_then_succeeds(stub):
+    stub.route('/flaky', Reply(503), Reply(200, b'ok'))
+    response = fetch_async(stub.url('/flaky'), client={'retry': RetryPolicy(retries=2, backoff=0.01)})
+    assert response.status == 200
+    assert stub.methods('/flaky') == ['GET', 'GET']
@@ -0,0 +1,94 @@
+import csv
+import os
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'MasterTool'))
+import cleaner  # noqa: E402
+from keyword_store import RAW_HEADER, KeywordStore  # noqa: E402
+
+ROWS = [
+    ('okx 怎么买', 'Google', 'okx'),
+    ('okx 下载', 'Bing', 'okx'),
+    ('okx 怎么买', 'Bing', 'okx'),  # same keyword from a second source
+    ('usdt, 价格', 'Google', 'usdt'),  # needs quoting
+    ('usdt "免费" 领取', 'DuckDuckGo', 'usdt'),
+    ('usdt 骗局', 'Google', 'usdt'),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with KeywordStore(str(tmp_path / 'keywords.sqlite')) as store:
+        yield store
+
+
+def write_raw(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(RAW_HEADER)
+        writer.writerows(rows)
+    return str(path)
+
+
+def clean(store, blacklist, chunk_size=2):
+    """cleaner.py's classification loop; returns how many keywords were (re)classified."""
+    rules = cleaner.rules_fingerprint(blacklist)
+    classified = 0
+    for results in cleaner.run_chunks(store.unclassified(rules, chunk_size), blacklist, workers=1):
+        store.save_classifications(results, rules)
+        classified += len(results)
+    return classified
+
+
+def test_snapshot_round_trip_is_byte_identical(store, tmp_path):
+    raw = write_raw(tmp_path / 'raw_keywords.csv', ROWS)
+    run_id = store.snapshot(raw)
+    assert run_id is not None and store.snapshot(raw) == run_id  # imported once
+    assert list(store.observations(run_id)) == ROWS
+    assert list(store.observation_counts(run_id))[0] == ('okx 怎么买', 'Google', 1)
+
+    exported = tmp_path / 'export.csv'
+    assert store.export_raw(str(exported), run_id) == len(ROWS)
+    assert exported.read_bytes() == (tmp_path / 'raw_keywords.csv').read_bytes()
+
+    with KeywordStore(str(tmp_path / 'other.sqlite')) as other:
+        again = tmp_path / 'again.csv'
+        other.export_raw(str(again), other.import_csv(str(exported)))
+    assert again.read_bytes() == exported.read_bytes()
+
+
+def test_rerun_with_same_rules_classifies_nothing(store, tmp_path):
+    run_id = store.snapshot(write_raw(tmp_path / 'raw_keywords.csv', ROWS))
+    blacklist = ['骗局']
+    assert clean(store, blacklist) == 5
+    assert clean(store, blacklist) == 0
+    assert list(store.unclassified(cleaner.rules_fingerprint(blacklist), 2)) == []
+
+    # A new mining run only brings its new keywords to the cleaner
+    mine = store.start_run('mine')
+    store.finish_run(mine, store.add_observations(mine, [('okx 怎么买', 'Google', 'okx'), ('okx 教程', 'Bing', 'okx')]))
+    assert store.snapshot() == mine
+    assert clean(store, blacklist) == 1
+    assert store.classification_counts(run_id, cleaner.rules_fingerprint(blacklist)) == (len(ROWS), 1)
+
+
+def test_changed_rules_reclassify_everything(store, tmp_path):
+    run_id = store.snapshot(write_raw(tmp_path / 'raw_keywords.csv', ROWS))
+    assert clean(store, ['骗局']) == 5
+    tasks = tmp_path / 'final_tasks.csv'
+    assert store.export_tasks(str(tasks), run_id, cleaner.rules_fingerprint(['骗局'])) == len(ROWS) - 1
+
+    blacklist = ['骗局', '免费']
+    rules = cleaner.rules_fingerprint(blacklist)
+    assert rules != cleaner.rules_fingerprint(['骗局'])
+    assert clean(store, blacklist) == 5
+    assert store.classification_counts(run_id, rules) == (len(ROWS), 2)
+    assert store.export_tasks(str(tasks), run_id, rules) == len(ROWS) - 2
+    with open(tasks, newline='', encoding='utf-8') as f:
+        exported = [(row['Keyword'], row['Intent']) for row in csv.DictReader(f)]
+    assert exported == [('okx 怎么买', 'Guide'), ('okx 下载', 'Download'), ('okx 怎么买', 'Guide'),
+                        ('usdt, 价格', 'Transactional')]
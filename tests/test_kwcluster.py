@@ -0,0 +1,52 @@
+from kwcluster import KeywordClusterer, cluster_keywords, edit_distance, keyword_key, normalize_keyword
+
+
+def groups(keywords):
+    return sorted(sorted(cluster.members) for cluster in cluster_keywords(keywords))
+
+
+def test_nfkc_folds_width_and_case():
+    assert normalize_keyword('ＵＳＤＴ　怎么买') == 'usdt 怎么买'
+    assert keyword_key('ｕｓｄｔ怎么买') == keyword_key('USDT怎么买') == 'usdt怎么买'
+
+
+def test_punctuation_and_spacing_are_ignored():
+    forms = ['usdt怎么买', 'USDT 怎么买', ' usdt  怎么买', 'usdt-怎么买？']
+    assert {keyword_key(form) for form in forms} == {'usdt怎么买'}
+    clusterer = KeywordClusterer()
+    for form in forms:
+        clusterer.add(form)
+    assert len(clusterer) == 1
+    [cluster] = clusterer.clusters()
+    assert cluster.count == 4
+    assert cluster.canonical == 'usdt 怎么买'  # two of the four forms normalize to this
+    assert cluster.variants['usdt-怎么买?'] == 1  # punctuation is only dropped from the key
+    assert keyword_key('？！') == '?!'  # all-punctuation keywords keep a key of their own
+
+
+def test_one_edit_cjk_variants_merge():
+    assert groups(['usdt怎么买', 'usdt怎么买', 'usdt币怎么买', 'usdt怎么购买']) == [
+        ['usdt币怎么买', 'usdt怎么买', 'usdt怎么购买']]
+
+
+def test_substitutions_and_latin_edits_stay_separate():
+    assert edit_distance('usdt怎么卖', 'usdt怎么买') == 2
+    assert groups(['usdt怎么买', 'usdt怎么卖', 'usd怎么买']) == sorted([['usd怎么买'], ['usdt怎么买'], ['usdt怎么卖']])
+    assert groups(['magic8价格', 'magic7价格']) == sorted([['magic7价格'], ['magic8价格']])
+
+
+def test_heaviest_form_is_the_centre():
+    clusterer = KeywordClusterer()
+    clusterer.add('usdt币怎么买', source='Bing')
+    clusterer.add('usdt怎么买', source='Google', count=3)
+    [cluster] = clusterer.clusters()
+    assert cluster.key == 'usdt怎么买' and cluster.canonical == 'usdt怎么买'
+    assert cluster.count == 4 and cluster.sources == {'Google', 'Bing'}
+    assert cluster.variants == {'usdt怎么买': 3, 'usdt币怎么买': 1}
+
+
+def test_score_is_per_observation():
+    clusterer = KeywordClusterer()
+    clusterer.add('usdt怎么买', score=2, count=3)
+    clusterer.add('USDT 怎么买', score=5)
+    assert clusterer.clusters()[0].score == 11
@@ -0,0 +1,77 @@
+import json
+import time
+
+from conftest import Reply
+from linkcheck import LinkChecker
+
+
+def checker(tmp_path, **kwargs):
+    options = {'cache_path': str(tmp_path / '.linkcheck_cache.json'), 'timeout': 2, 'retries': 2, 'backoff': 0.01}
+    options.update(kwargs)
+    return LinkChecker(**options)
+
+
+def test_head_ok(stub, tmp_path):
+    stub.route('/page')
+    lc = checker(tmp_path)
+    assert lc.check([stub.url('/page')]) == {stub.url('/page'): (200, True)}
+    assert stub.methods('/page') == ['HEAD']
+
+
+def test_head_rejected_falls_back_to_get(stub, tmp_path):
+    stub.route('/no-head', Reply(405), Reply(200))
+    lc = checker(tmp_path)
+    assert lc.check([stub.url('/no-head')])[stub.url('/no-head')] == (200, True)
+    assert stub.methods('/no-head') == ['HEAD', 'GET']
+    assert lc.stats['get_fallback'] == 1
+
+
+def test_retries_429_and_5xx(stub, tmp_path):
+    stub.route('/busy', Reply(429, headers={'Retry-After': '0'}), Reply(503), Reply(200))
+    lc = checker(tmp_path)
+    assert lc.check([stub.url('/busy')])[stub.url('/busy')] == (200, True)
+    assert stub.methods('/busy') == ['HEAD', 'HEAD', 'HEAD']
+    assert lc.stats['retries'] == 2
+
+
+def test_gives_up_after_retries(stub, tmp_path):
+    stub.route('/down', Reply(503))
+    lc = checker(tmp_path, retries=1)
+    assert lc.check([stub.url('/down')])[stub.url('/down')] == (503, False)
+    assert stub.methods('/down') == ['HEAD', 'HEAD']
+
+
+def test_timeout_is_reported_as_error(stub, tmp_path):
+    stub.route('/hang', Reply(200, delay=3))
+    lc = checker(tmp_path, timeout=0.5, retries=0)
+    started = time.perf_counter()
+    status, ok = lc.check([stub.url('/hang')])[stub.url('/hang')]
+    assert not ok and isinstance(status, str)
+    assert time.perf_counter() - started < 2
+
+
+def test_cache_hit_and_ttl_expiry(stub, tmp_path):
+    fresh, stale, stale_error = stub.url('/fresh'), stub.url('/stale'), stub.url('/stale-error')
+    for path in ('/fresh', '/stale', '/stale-error'):
+        stub.route(path)
+    now = time.time()
+    cache_path = tmp_path / '.linkcheck_cache.json'
+    cache_path.write_text(json.dumps({
+        fresh: {'status': 200, 'ok': True, 'checked_at': now - 10},
+        stale: {'status': 200, 'ok': True, 'checked_at': now - 200},
+        # Errors expire sooner than successes
+        stale_error: {'status': 500, 'ok': False, 'checked_at': now - 60},
+    }))
+
+    lc = checker(tmp_path, ttl=100, error_ttl=50)
+    results = lc.check([fresh, stale, stale_error])
+    assert results == {fresh: (200, True), stale: (200, True), stale_error: (200, True)}
+    assert stub.methods('/fresh') == []
+    assert stub.methods('/stale') == ['HEAD'] and stub.methods('/stale-error') == ['HEAD']
+    assert lc.stats['cached'] == 1 and lc.stats['checked'] == 2
+
+    # Rechecked results were written back with a new timestamp
+    saved = json.loads(cache_path.read_text())
+    assert saved[stale]['checked_at'] > now - 1
+    checker(tmp_path, ttl=100, error_ttl=50).check([stale])
+    assert stub.methods('/stale') == ['HEAD']
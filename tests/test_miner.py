@@ -0,0 +1,74 @@
+import os
+import sys
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'MasterTool'))
+import miner  # noqa: E402
+from miner import ExpansionScheduler, normalize_query  # noqa: E402
+
+
+def drain(scheduler, results):
+    """Pops every task the scheduler issues, answering each with results(query)."""
+    issued = []
+    while (task := scheduler.pop()) is not None:
+        issued.append(task)
+        scheduler.on_result(task, results(task[0]))
+    return issued
+
+
+def test_pops_by_priority():
+    scheduler = ExpansionScheduler(['okx', 'usdt'], budget=1000)
+    priorities = {}
+    push = scheduler.push
+
+    def spy(query, seed, depth, kind, priority):
+        priorities.setdefault(normalize_query(query), priority)
+        push(query, seed, depth, kind, priority)
+
+    scheduler.push = spy
+    # Seeds go first, in order; okx's three new keywords outrank usdt's one
+    assert scheduler.pop() == ('okx', 'okx')
+    scheduler.on_result(('okx', 'okx'), ['okx 官网', 'okx 注册', 'okx app'])
+    assert scheduler.pop() == ('usdt', 'usdt')
+    scheduler.on_result(('usdt', 'usdt'), ['usdt 价格'])
+
+    issued = drain(scheduler, lambda query: [])
+    assert issued[0] == ('okx 怎么', 'okx')  # modifier of the most productive query
+    order = [priorities[normalize_query(query)] for query, _ in issued]
+    assert order == sorted(order, reverse=True)
+    assert order.index(miner.EXPANSION_WEIGHTS['modifier']) > order.index(3 * miner.EXPANSION_WEIGHTS['suggestion'])
+
+
+def test_duplicate_queries_are_issued_once():
+    scheduler = ExpansionScheduler(['okx', 'OKX ', 'okx'], budget=1000)
+    # 'okx 教程' is both a suggestion and a modifier expansion of the seed
+    issued = drain(scheduler, lambda query: ['okx 教程', 'okx 下载 '] if query == 'okx' else [])
+    keys = [normalize_query(query) for query, _ in issued]
+    assert keys.count('okx') == 1 and keys.count('okx 教程') == 1 and keys.count('okx 下载') == 1
+    assert len(keys) == len(set(keys))
+
+
+def test_pruned_branches_are_never_issued():
+    results = {
+        'okx': ['okx 官网'],
+        'usdt': [],  # nothing new: the seed itself is not expanded
+        'okx 官网': ['okx 官网'],  # only a keyword already seen
+    }
+    scheduler = ExpansionScheduler(['okx', 'usdt'], budget=10000)
+    issued = [query for query, _ in drain(scheduler, lambda query: results.get(query, []))]
+    assert 'okx 怎么' in issued and 'okx a' in issued
+    assert not any(query.startswith('usdt ') for query in issued)
+    assert not any(query.startswith('okx 官网 ') for query in issued)
+    assert scheduler.pruned == len(issued) - 1  # everything but the okx seed
+
+
+def test_budget_caps_total_queries():
+    seeds = ['okx', 'usdt', 'btc']
+    budget = len(seeds) * miner.QUERIES_PER_SEED
+    scheduler = ExpansionScheduler(seeds, budget)
+    # Every query keeps producing new keywords, so expansion alone never runs dry
+    issued = drain(scheduler, lambda query: [f"{query} {n}" for n in ('新', '热')])
+    assert len(issued) == scheduler.issued == budget
+    assert scheduler.heap  # there was more to ask
+    assert scheduler.pop() is None
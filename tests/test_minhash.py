@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from minhash import MinHasher, choose_bands, lsh_clusters, normalize_text, shingles
+
+WORDS = ['okx', 'wallet', 'deposit', 'withdraw', 'fee', 'spot', 'futures', 'card', 'kyc', 'security',
+         'bitcoin', 'usdt', 'transfer', 'account', 'verify', 'app', 'trade', 'order', 'limit', 'market',
+         '欧易', '手续费', '充值', '提现', '钱包', '安全', '教程', '注册']
+
+
+def article(seed, words=400):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def signatures(docs, num_perm=128):
+    hasher = MinHasher(num_perm=num_perm)
+    return {key: hasher.signature(shingles(normalize_text(text))) for key, text in docs.items()}
+
+
+def jaccard(a, b):
+    a, b = shingles(normalize_text(a)), shingles(normalize_text(b))
+    return len(a & b) / len(a | b)
+
+
+@pytest.mark.parametrize('num_perm', [16, 64, 128, 100, 97])
+@pytest.mark.parametrize('threshold', [0.5, 0.8, 0.9])
+def test_choose_bands_fits_num_perm(num_perm, threshold):
+    bands, rows = choose_bands(num_perm, threshold)
+    assert bands >= 1 and rows >= 1
+    assert bands * rows <= num_perm
+
+
+def test_near_identical_pages_cluster():
+    base = article(1)
+    near = base.replace('fee', 'fees', 3) + ' updated'
+    docs = {'blog/fee.html': base, 'blog/fee-copy.html': near, 'blog/card.html': article(2), 'blog/kyc.html': article(3)}
+    assert jaccard(base, near) > 0.9
+    clusters = lsh_clusters(signatures(docs), threshold=0.8)
+    assert [members for members, _ in clusters] == [['blog/fee-copy.html', 'blog/fee.html']]
+    assert clusters[0][1] >= 0.8
+
+
+def test_dissimilar_pages_do_not_cluster():
+    docs = {f"p{i}.html": article(i) for i in range(20)}
+    assert max(jaccard(docs['p0.html'], docs[f"p{i}.html"]) for i in range(1, 20)) < 0.6
+    assert lsh_clusters(signatures(docs), threshold=0.8) == []
+
+
+def test_normalization_ignores_width_case_and_punctuation():
+    assert normalize_text('ＯＫＸ Wallet, 欧易！') == normalize_text('okx wallet 欧易')
+    assert lsh_clusters({}) == []
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from pagerank import pagerank, pagerank_arrays
+
+# a links to b twice (weight 2); d is dangling
+EDGES = [('a', 'b'), ('a', 'b'), ('a', 'c'), ('b', 'c'), ('c', 'a'), ('c', 'd'), ('e', 'a')]
+NODES = ['a', 'b', 'c', 'd', 'e']
+
+
+def dense_pagerank(edges, nodes, damping=0.85, teleport=None, iterations=2000):
+    """Textbook dense power iteration; dangling pages hand their rank to the teleport vector."""
+    index = {node: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+    weights = np.zeros((n, n))
+    for source, target in edges:
+        weights[index[target], index[source]] += 1
+    out = weights.sum(axis=0)
+    t = np.full(n, 1 / n) if teleport is None else np.array([teleport.get(node, 0.0) for node in nodes])
+    t = t / t.sum()
+    matrix = np.where(out > 0, weights / np.where(out > 0, out, 1), t[:, None])
+    x = t.copy()
+    for _ in range(iterations):
+        x = damping * matrix @ x + (1 - damping) * t
+    return dict(zip(nodes, x))
+
+
+def test_matches_dense_power_iteration():
+    scores, _ = pagerank(EDGES, nodes=NODES)
+    expected = dense_pagerank(EDGES, NODES)
+    assert sum(scores.values()) == pytest.approx(1)
+    for node in NODES:
+        assert scores[node] == pytest.approx(expected[node], abs=1e-9)
+
+
+def test_dangling_and_isolated_nodes():
+    # 'z' has no links at all, 'd' only inbound ones: both keep the scores summing to 1
+    scores, _ = pagerank(EDGES, nodes=NODES + ['z'])
+    expected = dense_pagerank(EDGES, NODES + ['z'])
+    assert sum(scores.values()) == pytest.approx(1)
+    assert scores['z'] == pytest.approx(expected['z'], abs=1e-9)
+    assert scores['z'] < scores['d']
+
+
+def test_tol_stops_early():
+    _, exact_iterations = pagerank(EDGES, nodes=NODES, tol=1e-12)
+    loose, loose_iterations = pagerank(EDGES, nodes=NODES, tol=1e-2)
+    assert loose_iterations < exact_iterations < 200
+    _, capped = pagerank(EDGES, nodes=NODES, tol=0, max_iter=7)
+    assert capped == 7
+    expected = dense_pagerank(EDGES, NODES)
+    assert sum(abs(loose[node] - expected[node]) for node in NODES) < 0.05
+
+
+def test_personalization_matches_dense_teleport():
+    teleport = {'b': 1.0, 'e': 3.0}
+    scores, _ = pagerank(EDGES, nodes=NODES, personalization=teleport)
+    expected = dense_pagerank(EDGES, NODES, teleport=teleport)
+    for node in NODES:
+        assert scores[node] == pytest.approx(expected[node], abs=1e-9)
+    assert scores['e'] > pagerank(EDGES, nodes=NODES)[0]['e']
+
+
+def test_personalization_without_known_nodes_raises():
+    with pytest.raises(ValueError):
+        pagerank(EDGES, nodes=NODES, personalization={'missing.html': 1.0})
+
+
+def test_array_solver_and_empty_graph():
+    x, _ = pagerank_arrays(np.array([0, 1]), np.array([1, 0]), 2)
+    assert x.tolist() == pytest.approx([0.5, 0.5])
+    assert pagerank([]) == ({}, 0)
+
+
+def test_audit_falls_back_to_uniform_pagerank(tmp_path):
+    from audit import Auditor
+
+    (tmp_path / 'index.html').write_text('<html><body><h1>Home</h1><a href="/fee">Fee</a></body></html>')
+    (tmp_path / 'fee.html').write_text('<html><body><h1>Fee</h1><a href="/">Home</a></body></html>')
+    auditor = Auditor(str(tmp_path), use_cache=False)
+    auditor.config.money_pages = ['missing.html']
+    auditor.scan_files()
+    top = auditor.analyze_graph()
+    assert {page for page, _ in top} == {'index.html', 'fee.html'}
+    assert sum(auditor.pagerank.values()) == pytest.approx(2)
@@ -0,0 +1,39 @@
+import json
+
+from run_journal import RunJournal
+
+
+def test_record_after_torn_line(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = RunJournal(str(path))
+    journal.record('a', 1)
+    journal.close()
+    # Killed mid-write: the last line has no newline
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"id": "b", "pay')
+
+    resumed = RunJournal(str(path))
+    assert list(resumed.entries()) == [('a', 1)]
+    resumed.record('c', 3)
+    resumed.record('d', 4)
+    resumed.close()
+    assert list(RunJournal(str(path)).entries()) == [('a', 1), ('c', 3), ('d', 4)]
+    assert all(json.loads(line) for line in path.read_text(encoding='utf-8').splitlines())
+
+
+def test_torn_only_line_is_dropped(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text('{"id": "a"', encoding='utf-8')
+    journal = RunJournal(str(path))
+    journal.record('b', {'keywords': ['x']})
+    journal.close()
+    assert list(journal.entries()) == [('b', {'keywords': ['x']})]
+
+
+def test_finish_removes_journal(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = RunJournal(str(path))
+    journal.record('a', 1)
+    assert journal.completed_ids() == {'a'}
+    journal.finish()
+    assert not path.exists() and list(journal.entries()) == []
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from conftest import Reply
+from httpclient import NO_RETRY, AsyncHttpClient, HttpClient
+from standin import FixtureStore, fixture_key, make_server
+
+SUGGEST = json.dumps(['usdt', ['usdt怎么买', 'usdt价格']], ensure_ascii=False)
+BINARY = bytes(range(256))
+
+
+def exchange(sync_client, async_client_factory, base):
+    """The requests the tools make: GET with params, a binary body, a JSON POST (sync and async)."""
+    responses = [
+        sync_client.get(base + '/complete/search', params={'q': 'usdt', 'hl': 'zh-CN'}),
+        sync_client.get(base + '/logo.bin'),
+        sync_client.post(base + '/indexnow', json={'host': 'example.com', 'urlList': ['https://example.com/']}),
+    ]
+
+    async def run():
+        async with async_client_factory() as client:
+            return [await client.get(base + '/complete/search', params={'q': 'btc'}),
+                    await client.post(base + '/indexnow', json={'urlList': ['https://example.com/'], 'host': 'example.com'})]
+
+    return responses + asyncio.run(run())
+
+
+def snapshot(responses):
+    return [(r.status, r.headers.get('Content-Type'), r.content) for r in responses]
+
+
+def test_record_then_replay_is_byte_identical(stub, tmp_path, monkeypatch):
+    stub.route('/complete/search', Reply(200, SUGGEST, {'Content-Type': 'application/json; charset=UTF-8'}),
+               Reply(200, '["btc",["btc价格"]]', {'Content-Type': 'application/json; charset=UTF-8'}))
+    stub.route('/logo.bin', Reply(200, BINARY, {'Content-Type': 'application/octet-stream'}))
+    stub.route('/indexnow', Reply(202, b''))
+    fixtures = tmp_path / 'http_fixtures.jsonl'
+
+    # 1. Record against the live (stub) endpoints
+    monkeypatch.setenv('HTTP_RECORD', str(fixtures))
+    with HttpClient(retry=NO_RETRY) as client:
+        recorded = snapshot(exchange(client, lambda: AsyncHttpClient(retry=NO_RETRY), stub.base))
+    assert [status for status, _, _ in recorded] == [200, 200, 202, 200, 202]
+    assert len(fixtures.read_text(encoding='utf-8').splitlines()) == 5
+    stub.server.shutdown()  # replay must not touch the original server
+
+    # 2. Replay through the stand-in
+    store = FixtureStore(str(fixtures))
+    assert fixture_key('GET', stub.base + '/complete/search?q=usdt&hl=zh-CN') in store.entries
+    server = make_server(store, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        monkeypatch.delenv('HTTP_RECORD')
+        monkeypatch.setenv('HTTP_STANDIN', f"http://127.0.0.1:{server.server_port}")
+        with HttpClient(retry=NO_RETRY) as client:
+            replayed = snapshot(exchange(client, lambda: AsyncHttpClient(retry=NO_RETRY), stub.base))
+        stats = server.RequestHandlerClass.stats
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert replayed == recorded
+    assert replayed[1][2] == BINARY
+    assert stats['served'] == 5 and stats['missed'] == 0
+
+
+@pytest.mark.parametrize('body', [{'b': 1, 'a': [1, 2]}, '{"a": [1, 2], "b": 1}'])
+def test_fixture_key_ignores_parameter_and_json_key_order(body):
+    assert fixture_key('get', 'https://h/p?b=2&a=1') == fixture_key('GET', 'https://h/p', params={'a': 1, 'b': 2})
+    assert fixture_key('POST', 'https://h/p', body=json.dumps(body) if isinstance(body, dict) else body) == \
+        fixture_key('POST', 'https://h/p', body='{"b":1,"a":[1,2]}')
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+import submit_indexnow
+from conftest import Reply
+
+KEY = '0123456789abcdef'
+PAGES = ['', 'blog/fee', 'blog/card']
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """Three pages, their sitemap and the key file in a temporary working directory."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / submit_indexnow.KEY_FILE).write_text(KEY)
+    (tmp_path / 'blog').mkdir()
+    for page in PAGES:
+        (tmp_path / (f"{page}.html" if page else 'index.html')).write_text(f"<h1>{page or 'home'}</h1>")
+    urls = ''.join(f"<url><loc>https://{submit_indexnow.HOST}/{page}</loc><lastmod>2026-01-01</lastmod></url>"
+                   for page in PAGES)
+    (tmp_path / 'sitemap.xml').write_text(
+        f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>')
+    return tmp_path
+
+
+def submit(stub, *args):
+    return submit_indexnow.submit_to_indexnow(['--endpoint', stub.url('/indexnow'), '--backoff', '0.01', *args])
+
+
+def posted_batches(stub):
+    return [json.loads(body)['urlList'] for method, path, body in stub.requests if method == 'POST']
+
+
+def test_batches_retries_and_ledger(stub, site):
+    # The first batch is throttled once, then accepted
+    stub.route('/indexnow', Reply(429, headers={'Retry-After': '0'}), Reply(200))
+    assert submit(stub, '--batch-size', '2') == 0
+    batches = posted_batches(stub)
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0] == batches[1]  # retried
+    payload = json.loads(stub.requests[0][2])
+    assert payload['key'] == KEY and payload['host'] == submit_indexnow.HOST
+
+    ledger = json.loads((site / submit_indexnow.LEDGER_FILE).read_text())
+    assert sorted(ledger) == sorted(f"https://{submit_indexnow.HOST}/{page}" for page in PAGES)
+
+    # Nothing changed: nothing is sent
+    stub.requests.clear()
+    assert submit(stub) == 0
+    assert posted_batches(stub) == []
+
+    # Only the page whose content changed is resubmitted
+    (site / 'blog' / 'fee.html').write_text('<h1>fee, updated</h1>')
+    assert submit(stub) == 0
+    assert posted_batches(stub) == [[f"https://{submit_indexnow.HOST}/blog/fee"]]
+
+
+def test_failed_batch_is_retried_next_run(stub, site):
+    stub.route('/indexnow', Reply(200), Reply(403))
+    assert submit(stub, '--batch-size', '2') == 1
+    assert len(json.loads((site / submit_indexnow.LEDGER_FILE).read_text())) == 2
+
+    stub.route('/indexnow', Reply(200))
+    stub.requests.clear()
+    assert submit(stub, '--batch-size', '2') == 0
+    assert posted_batches(stub) == [[f"https://{submit_indexnow.HOST}/blog/card"]]
+
+
+def notify(stub, urls, **kwargs):
+    import asyncio
+    endpoints = [(stub.url('/accepts'), 100.0, 5), (stub.url('/rejects'), 100.0, 5)]
+    return asyncio.run(submit_indexnow.notify_async(urls, endpoints, backoff=0.01, **kwargs))
+
+
+def test_notify_records_accepted_batches_in_ledger(stub, site):
+    stub.route('/accepts', Reply(202))
+    stub.route('/rejects', Reply(403))
+    urls = [f"https://{submit_indexnow.HOST}/{page}" for page in PAGES[:2]]
+    records = notify(stub, urls, batch_size=1)
+    assert sorted((r['endpoint'].rsplit('/', 1)[1], r['ok']) for r in records) == [
+        ('accepts', True), ('accepts', True), ('rejects', False)]  # a failing endpoint stops after one batch
+
+    log = [json.loads(line) for line in (site / submit_indexnow.NOTIFY_LOG).read_text().splitlines()]
+    assert len(log) == 3
+
+    # What --notify pushed is not submitted again
+    stub.route('/indexnow', Reply(200))
+    stub.requests.clear()
+    assert submit(stub) == 0
+    assert posted_batches(stub) == [[f"https://{submit_indexnow.HOST}/blog/card"]]
+
+
+def test_notify_failures_go_to_stderr(stub, site, capsys):
+    (site / submit_indexnow.KEY_FILE).unlink()
+    assert submit_indexnow.submit_to_indexnow(['--notify', f"https://{submit_indexnow.HOST}/"]) == 1
+    assert submit_indexnow.KEY_FILE in capsys.readouterr().err
+
+
+def test_background_notify_failures_keep_log_parseable(stub, site):
+    stub.route('/rejects', Reply(403))
+    background = lambda: submit_indexnow.notify_in_background(
+        [f"https://{submit_indexnow.HOST}/blog/fee"], [stub.url('/rejects')], root_dir=str(site))
+    assert background().wait(timeout=30) == 1
+    (site / submit_indexnow.KEY_FILE).unlink()
+    assert background().wait(timeout=30) == 1
+
+    # Only the endpoint's answer is logged; the process's error output goes elsewhere
+    log = [json.loads(line) for line in (site / submit_indexnow.NOTIFY_LOG).read_text(encoding='utf-8').splitlines()]
+    assert [(record['ok'], record['status']) for record in log] == [(False, 403)]
+    errors = (site / submit_indexnow.NOTIFY_ERR).read_text(encoding='utf-8')
+    assert '403' in errors and submit_indexnow.KEY_FILE in errors
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from textmatch import BLACKLISTED, PatternMatcher, contains_chinese
+
+RULES = {
+    'Guide': ['教程', 'How To', '怎么'],
+    'Buy': ['怎么买', 'buy usdt'],  # 怎么 is a prefix of 怎么买
+    'Fee': ['手续费', '费'],  # 费 is a suffix of 手续费
+    'Coin': ['usdt', 'sdt', 'us'],  # overlapping and nested terms
+    'Login': ['login', 'gin'],
+}
+ORDER = ['Buy', 'Fee', 'Guide', 'Coin', 'Login']
+
+
+def naive_labels(rules, text):
+    text = text.lower()
+    return {label for label, terms in rules.items() if any(term.lower() in text for term in terms)}
+
+
+def naive_first(rules, text, order):
+    labels = naive_labels(rules, text)
+    return next((label for label in order if label in labels), None)
+
+
+@pytest.mark.parametrize('text', [
+    'USDT怎么买',
+    'okx 手续费 教程',
+    '币安的费率',
+    'How to BUY USDT',
+    'hOW tO login',
+    'begin',  # 'gin' only as the tail of another word
+    'usd',  # 'us' but not 'usdt' or 'sdt'
+    'ＯＫＸ 注册',  # full-width Latin is not folded by str.lower
+    '欧易下载',
+    '',
+])
+def test_matches_naive_substring_search(text):
+    matcher = PatternMatcher(RULES)
+    assert matcher.labels(text) == naive_labels(RULES, text)
+    assert matcher.first(text, ORDER) == naive_first(RULES, text, ORDER)
+
+
+def test_random_texts_over_small_alphabet():
+    # A tiny alphabet makes overlaps and suffix terms the common case
+    rng = random.Random(7)
+    alphabet = 'abAB币买'
+    rules = {f"L{n}": [''.join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(3)] for n in range(8)}
+    order = sorted(rules)
+    matcher = PatternMatcher(rules)
+    for _ in range(500):
+        text = ''.join(rng.choices(alphabet, k=rng.randint(0, 12)))
+        assert matcher.labels(text) == naive_labels(rules, text), text
+        assert matcher.first(text, order) == naive_first(rules, text, order), text
+
+
+def test_terms_added_after_first_use_are_matched():
+    matcher = PatternMatcher({'Guide': ['教程']})
+    assert matcher.labels('欧易 注册教程') == {'Guide'}
+    matcher.add_terms(BLACKLISTED, ['注册', ''])
+    assert matcher.labels('欧易 注册教程') == {'Guide', BLACKLISTED}
+    assert matcher.terms == 2
+
+
+def test_contains_chinese():
+    assert contains_chinese('okx 教程')
+    assert not contains_chinese('okx tutorial ＯＫＸ')
@@ -0,0 +1,98 @@
+"""
+Multi-pattern substring matching (Aho-Corasick) for the keyword classifiers:
+cleaner.py (blacklist + intents), analyzer.py (intents) and build.py (blog
+categories).
+
+    matcher = PatternMatcher({'Guide': ['教程', 'how to'], 'Fee': ['手续费']})
+    matcher.add_terms(BLACKLISTED, blacklist)
+    labels = matcher.labels("OKX 手续费教程")   # {'Guide', 'Fee'}
+
+All term lists are compiled into one automaton, built lazily on first use.
+Classifying a string is then a single pass over its characters, whatever the
+number of terms or categories, so the rule sets can grow into the thousands.
+Terms and text go through the same `normalize` (str.lower by default, the
+same folding the old `term in text.lower()` loops used).
+"""
+import re
+from collections import deque
+
+# Label for blacklist terms when they share an automaton with other categories
+BLACKLISTED = '__blacklisted__'
+
+CJK_RE = re.compile(r'[\u4e00-\u9fa5]')
+
+
+def contains_chinese(text):
+    """True if the text has at least one CJK unified ideograph."""
+    return CJK_RE.search(text) is not None
+
+
+class PatternMatcher:
+    def __init__(self, rules=None, normalize=str.lower):
+        self.normalize = normalize
+        self.terms = 0
+        self._goto = [{}]
+        self._terminal = [set()]
+        self._fail = None
+        self._out = None
+        for label, terms in (rules or {}).items():
+            self.add_terms(label, terms)
+
+    def add_terms(self, label, terms):
+        for term in terms:
+            term = self.normalize(term)
+            if not term:
+                continue
+            node = 0
+            for ch in term:
+                child = self._goto[node].get(ch)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][ch] = child
+                    self._goto.append({})
+                    self._terminal.append(set())
+                node = child
+            self._terminal[node].add(label)
+            self.terms += 1
+        self._fail = None
+
+    def _build(self):
+        goto = self._goto
+        fail = [0] * len(goto)
+        out = [set(labels) for labels in self._terminal]
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(ch, 0)
+                # A state also reports every term that is a suffix of its path
+                out[child] |= out[fail[child]]
+                queue.append(child)
+        self._fail = fail
+        self._out = [frozenset(labels) for labels in out]
+
+    def labels(self, text):
+        """Set of labels whose terms occur anywhere in `text`."""
+        if self._fail is None:
+            self._build()
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for ch in self.normalize(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+    def first(self, text, order):
+        """First label in `order` that matches `text`, or None."""
+        labels = self.labels(text)
+        for label in order:
+            if label in labels:
+                return label
+        return None